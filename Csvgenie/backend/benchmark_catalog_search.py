@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Catalog Search Benchmark: compare the indexed /catalog/search path against the
+linear name scan it replaced, on the real catalog and on scaled-up copies of it
+
+Usage:
+    python benchmark_catalog_search.py [scale ...]
+"""
+
+import sys
+import time
+import tempfile
+from pathlib import Path
+
+# Add the backend directory to Python path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from models.catalog_store import CatalogStore
+from services.catalog_search import CatalogSearchIndex
+from services.catalog_service import CatalogService
+
+QUERIES = ["ri", "rice", "toor dal", "basmati", "10x4lb", "masala", "oil 1l", "zzz"]
+LIMIT = 10
+
+def linear_search(items, query: str, limit: int):
+    """The original search_items loop"""
+    query_lower = query.lower()
+    results = []
+    for item in items:
+        if query_lower in item.item_name.lower():
+            results.append(item)
+            if len(results) >= limit:
+                break
+    return results
+
+def time_per_query(func, repeat: int) -> float:
+    """Average milliseconds per call over every query"""
+    start_time = time.perf_counter()
+    for _ in range(repeat):
+        for query in QUERIES:
+            func(query)
+    return (time.perf_counter() - start_time) / (repeat * len(QUERIES)) * 1000
+
+def benchmark(items, scale: int):
+    if scale > 1:
+        items = [item.model_copy(update={"item_name": f"{item.item_name} {copy}"})
+                 for copy in range(scale) for item in items]
+    
+    start_time = time.perf_counter()
+    index = CatalogSearchIndex(CatalogStore.from_items(items))
+    build_ms = (time.perf_counter() - start_time) * 1000
+    
+    index_ms = time_per_query(lambda query: index.search(query, LIMIT), repeat=50)
+    linear_ms = time_per_query(lambda query: linear_search(items, query, LIMIT), repeat=2)
+    
+    print(f"📦 {len(items):>9,} items (x{scale})")
+    print(f"   Index build:   {build_ms:10.1f} ms")
+    print(f"   Indexed query: {index_ms:10.3f} ms")
+    print(f"   Linear scan:   {linear_ms:10.3f} ms ({linear_ms / index_ms:.0f}x slower)")
+
+def main():
+    import logging
+    logging.disable(logging.WARNING)
+    
+    scales = [int(scale) for scale in sys.argv[1:]] or [1, 10, 100]
+    catalog_service = CatalogService()
+    # Keep the snapshot written while loading out of the real temp/ directory
+    with tempfile.TemporaryDirectory() as snapshot_dir:
+        catalog_service.snapshot_file = Path(snapshot_dir) / "catalog.snapshot"
+        catalog_service.load_catalog()
+    items = catalog_service.get_catalog_items()
+    
+    print("🧪 Catalog Search Benchmark")
+    print("=" * 50)
+    print(f"Queries: {QUERIES} (limit {LIMIT})")
+    for scale in scales:
+        benchmark(items, scale)
+
+if __name__ == "__main__":
+    main()
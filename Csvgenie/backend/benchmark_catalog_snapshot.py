@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Catalog Snapshot Benchmark: compare loading the catalog from the binary snapshot
+against the catalog.json path, on the real catalog and on scaled-up copies of it
+
+Usage:
+    python benchmark_catalog_snapshot.py [scale ...]
+"""
+
+import gc
+import sys
+import json
+import time
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+# Add the backend directory to Python path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from models.catalog_store import CatalogStore
+from services.catalog_search import CatalogSearchIndex
+from services.catalog_service import CatalogService
+
+def scaled_store(store: CatalogStore, scale: int) -> CatalogStore:
+    """Repeat the catalog `scale` times with distinct codes and names"""
+    if scale == 1:
+        return store
+    rows = list(store.rows())
+    return CatalogStore.from_columns(
+        [f"{row.item_code}-{copy}" for copy in range(scale) for row in rows],
+        [f"{row.item_name} {copy}" for copy in range(scale) for row in rows],
+        [row.category for _ in range(scale) for row in rows],
+        [row.source_file for _ in range(scale) for row in rows],
+        [row.sheet_name for _ in range(scale) for row in rows]
+    )
+
+def measure_load(load, repeat: int = 3) -> dict:
+    """Best load time over a few runs, then Python heap use (retained and peak) of one more"""
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start_time = time.perf_counter()
+        service = load()
+        timings.append((time.perf_counter() - start_time) * 1000)
+        assert service.is_loaded()
+        del service
+    
+    # Separate run: tracemalloc slows every allocation down, so it would distort the timings
+    gc.collect()
+    tracemalloc.start()
+    service = load()  # Held until measured, so "retained" counts the loaded catalog
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del service
+    return {"ms": min(timings), "retained_mb": retained / 1e6, "peak_mb": peak / 1e6}
+
+def benchmark(store: CatalogStore, scale: int, work_dir: Path):
+    store = scaled_store(store, scale)
+    
+    writer = CatalogService()
+    writer.snapshot_file = work_dir / f"catalog_{scale}.snapshot"
+    writer.catalog_file = work_dir / f"catalog_{scale}.json"
+    writer.store = store
+    writer.search_index = CatalogSearchIndex(store)
+    writer.save_catalog_snapshot()
+    with open(writer.catalog_file, 'w', encoding='utf-8') as f:
+        json.dump({'metadata': {'total_items': len(store)}, 'items': store.to_records()}, f, indent=2, ensure_ascii=False)
+    
+    def load_from(method_name: str):
+        def load():
+            service = CatalogService()
+            service.snapshot_file = writer.snapshot_file
+            service.catalog_file = writer.catalog_file
+            getattr(service, method_name)()
+            return service
+        return load
+    
+    json_result = measure_load(load_from("load_catalog_from_json"))
+    snapshot_result = measure_load(load_from("load_catalog_snapshot"))
+    
+    print(f"📦 {len(store):>9,} items (x{scale})")
+    print(f"   catalog.json: {writer.catalog_file.stat().st_size / 1e6:7.1f} MB file, "
+          f"{json_result['ms']:9.1f} ms, {json_result['retained_mb']:7.1f} MB retained, "
+          f"{json_result['peak_mb']:7.1f} MB peak")
+    print(f"   snapshot:     {writer.snapshot_file.stat().st_size / 1e6:7.1f} MB file, "
+          f"{snapshot_result['ms']:9.1f} ms, {snapshot_result['retained_mb']:7.1f} MB retained, "
+          f"{snapshot_result['peak_mb']:7.1f} MB peak "
+          f"({json_result['ms'] / snapshot_result['ms']:.0f}x faster)")
+
+def main():
+    import logging
+    logging.disable(logging.WARNING)
+    
+    scales = [int(scale) for scale in sys.argv[1:]] or [1, 10, 100]
+    catalog_service = CatalogService()
+    # Keep the snapshot written while loading out of the real temp/ directory
+    with tempfile.TemporaryDirectory() as snapshot_dir:
+        catalog_service.snapshot_file = Path(snapshot_dir) / "catalog.snapshot"
+        catalog_service.load_catalog()
+    
+    print("🧪 Catalog Snapshot Benchmark")
+    print("=" * 50)
+    print("Both paths end with a loaded CatalogStore and search index; retained/peak count the")
+    print("Python heap only - snapshot columns are read-only file mappings shared between processes")
+    with tempfile.TemporaryDirectory() as work_dir:
+        for scale in scales:
+            benchmark(catalog_service.get_catalog_store(), scale, Path(work_dir))
+
+if __name__ == "__main__":
+    main()
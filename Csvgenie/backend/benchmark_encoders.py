@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Encoder Backend Benchmark: compare PyTorch, ONNX Runtime and int8 ONNX encoders
+on throughput and on how often they pick the same catalog item for tests/samples
+
+Usage:
+    python benchmark_encoders.py [torch onnx onnx-int8]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Add the backend directory to Python path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from config import config
+from services.catalog_service import CatalogService
+from services.encoders import ENCODER_BACKENDS, encoder_backend
+from services.order_processor import OrderProcessor
+
+def load_sample_orders():
+    """Read every sample order file as (name, text)"""
+    samples_dir = backend_dir.parent / "tests" / "samples"
+    return [(sample_file.name, sample_file.read_text(encoding="utf-8"))
+            for sample_file in sorted(samples_dir.glob("*.txt"))]
+
+def match_codes(processor: OrderProcessor, orders):
+    """Map each order line to the chosen item code (None if unmapped)"""
+    codes = {}
+    for name, text in orders:
+        for position, line_match in enumerate(
+                match for batch in processor.iter_line_matches(text.split('\n')) for match in batch):
+            mapped = line_match.mapped_item
+            codes[(name, position)] = mapped.item_code if mapped is not None else None
+    return codes
+
+def benchmark_backend(backend: str, catalog_service: CatalogService, orders, repeat: int = 3):
+    """Time catalog and query encoding for one backend and collect its matches"""
+    config.ENCODER_BACKEND = backend
+    
+    start_time = time.perf_counter()
+    processor = OrderProcessor(catalog_service)
+    processor.load_model()
+    load_ms = (time.perf_counter() - start_time) * 1000
+    
+    actual_backend = encoder_backend(processor.model)
+    if actual_backend != backend:
+        print(f"❌ {backend} is unavailable (fell back to {actual_backend}), skipping")
+        return None
+    
+    texts = [processor._preprocess_catalog_text(row) for row in catalog_service.get_catalog_store().rows()]
+    processor.model.encode(texts[:config.BATCH_SIZE], batch_size=config.BATCH_SIZE)  # Warm up
+    
+    start_time = time.perf_counter()
+    for _ in range(repeat):
+        processor.model.encode(texts, batch_size=max(1, config.BATCH_SIZE))
+    elapsed = (time.perf_counter() - start_time) / repeat
+    
+    return {
+        "backend": backend,
+        "load_ms": load_ms,
+        "texts_per_second": len(texts) / elapsed if elapsed else 0.0,
+        "codes": match_codes(processor, orders)
+    }
+
+def main():
+    import logging
+    logging.disable(logging.WARNING)
+    
+    backends = sys.argv[1:] or list(ENCODER_BACKENDS)
+    unknown = [backend for backend in backends if backend not in ENCODER_BACKENDS]
+    if unknown:
+        print(f"❌ Unknown backends: {unknown} (expected {ENCODER_BACKENDS})")
+        sys.exit(1)
+    
+    print("🧪 Encoder Backend Benchmark")
+    print("=" * 50)
+    print(f"Model: {config.MODEL_NAME}")
+    
+    # Each backend must encode the catalog itself rather than reuse another backend's cache
+    config.ENABLE_EMBEDDINGS_CACHE = False
+    config.LINE_CACHE_SIZE = 0
+    config.QUERY_CACHE_SIZE = 0
+    
+    catalog_service = CatalogService()
+    catalog_service.load_catalog()
+    orders = load_sample_orders()
+    print(f"📦 {len(catalog_service.get_catalog_store())} catalog items, {len(orders)} sample orders\n")
+    
+    results = [result for result in (benchmark_backend(backend, catalog_service, orders) for backend in backends)
+               if result is not None]
+    if not results:
+        return
+    
+    reference = results[0]
+    print(f"{'Backend':<12} {'Load ms':>10} {'Texts/s':>10} {'Speedup':>9} {'Agreement':>10}")
+    for result in results:
+        same = sum(1 for key, code in result["codes"].items() if reference["codes"].get(key) == code)
+        agreement = same / len(result["codes"]) if result["codes"] else 1.0
+        speedup = result["texts_per_second"] / reference["texts_per_second"] if reference["texts_per_second"] else 0.0
+        print(f"{result['backend']:<12} {result['load_ms']:>10.0f} {result['texts_per_second']:>10.0f} "
+              f"{speedup:>8.2f}x {agreement:>9.1%}")
+    
+    print(f"\nAgreement = share of sample order lines mapped to the same item code as {reference['backend']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Quantity Parser Benchmark: measure how many order lines per second
+utils.quantity_parser can classify
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Add the backend directory to Python path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from utils.quantity_parser import parse_quantity_line
+
+# Representative order lines, one per parser branch plus the fallbacks
+SAMPLE_LINES = [
+    "Cardamom green 5lb *3pkts",
+    "Cinnamon 5lb *3",
+    "Urad Dhal 4*10lb- 1 case",
+    "Moong dal - 2 boxes",
+    "Toor dal 3",
+    "2 bags of organic apples",
+    "1 case (12 cans) of pachranga achar",
+    "Idly and dosa rice - 150lbs",
+    "2 lbs apples",
+    "MOONG DAL 12X2LB",
+    "150lbs",
+    "Jeera",
+]
+
+def load_lines():
+    """Use the sample order files when available, otherwise the built-in lines"""
+    lines = list(SAMPLE_LINES)
+    samples_dir = backend_dir.parent / "tests" / "samples"
+    for sample_file in sorted(samples_dir.glob("*.txt")):
+        lines.extend(line.strip() for line in sample_file.read_text(encoding="utf-8").splitlines() if line.strip())
+    return lines
+
+def benchmark(lines, repeat: int = 2000):
+    """Parse every line `repeat` times and report throughput"""
+    # Warm up
+    for line in lines:
+        parse_quantity_line(line)
+    
+    total = len(lines) * repeat
+    start_time = time.perf_counter()
+    for _ in range(repeat):
+        for line in lines:
+            parse_quantity_line(line)
+    elapsed = time.perf_counter() - start_time
+    
+    print(f"📏 Parsed {total:,} lines in {elapsed:.3f}s")
+    print(f"⚡ {total / elapsed:,.0f} lines/second ({elapsed / total * 1e6:.2f} µs/line)")
+
+def main():
+    import logging
+    logging.disable(logging.WARNING)  # "No pattern matched" warnings would dominate the timing
+    
+    lines = load_lines()
+    print("🧪 Quantity Parser Benchmark")
+    print("=" * 50)
+    print(f"📄 {len(lines)} distinct sample lines")
+    
+    print("\nSample results:")
+    for line in lines[:len(SAMPLE_LINES)]:
+        quantity, item_text = parse_quantity_line(line)
+        print(f"  {line!r:45} → qty={quantity:g}, item={item_text!r}")
+    
+    print()
+    benchmark(lines)
+
+if __name__ == "__main__":
+    main()
@@ -23,6 +23,11 @@ class Config:
     # MODEL_NAME: str = os.getenv("MODEL_NAME", "sentence-transformers/all-MiniLM-L6-v2")  # Better accuracy, more memory
     # MODEL_NAME: str = os.getenv("MODEL_NAME", "sentence-transformers/all-mpnet-base-v2")  # Best accuracy, most memory
     
+    # Encoder backend: "torch" (SentenceTransformer), "onnx" or "onnx-int8" (onnxruntime, CPU only)
+    # The ONNX model is exported once into ONNX_CACHE_DIR; later starts skip PyTorch entirely
+    ENCODER_BACKEND: str = os.getenv("ENCODER_BACKEND", "torch")
+    ONNX_CACHE_DIR: Path = Path(os.getenv("ONNX_CACHE_DIR", str(Path(__file__).parent / "temp" / "onnx")))
+    
     # Improved confidence thresholds
     CONFIDENCE_THRESHOLD_HIGH: float = float(os.getenv("CONFIDENCE_THRESHOLD_HIGH", "0.75"))
     CONFIDENCE_THRESHOLD_MEDIUM: float = float(os.getenv("CONFIDENCE_THRESHOLD_MEDIUM", "0.55"))
@@ -33,13 +38,53 @@ class Config:
     MAX_CANDIDATES_PER_ITEM: int = int(os.getenv("MAX_CANDIDATES_PER_ITEM", "3"))
     USE_FUZZY_MATCHING: bool = os.getenv("USE_FUZZY_MATCHING", "true").lower() == "true"
     
+    # Vector index - "exact" scans the whole catalog, "ivf" probes the IVF_NPROBE nearest clusters
+    # (raise IVF_NPROBE for better recall, lower it for lower latency)
+    VECTOR_INDEX: str = os.getenv("VECTOR_INDEX", "exact")
+    IVF_NLIST: int = int(os.getenv("IVF_NLIST", "0"))  # 0 = about 4 * sqrt(catalog size)
+    IVF_NPROBE: int = int(os.getenv("IVF_NPROBE", "8"))
+    IVF_MIN_ITEMS: int = int(os.getenv("IVF_MIN_ITEMS", "20000"))
+    # Catalog embedding storage: "float32", or "float16"/"int8" to save memory on small instances
+    EMBEDDING_PRECISION: str = os.getenv("EMBEDDING_PRECISION", "float32")
+    
     # Memory optimization for Render free tier
     BATCH_SIZE: int = int(os.getenv("BATCH_SIZE", "50"))  # Process items in smaller batches
     ENABLE_EMBEDDINGS_CACHE: bool = os.getenv("ENABLE_EMBEDDINGS_CACHE", "true").lower() == "true"
+    # Memory-map the cached catalog embeddings read-only so all uvicorn workers share one copy
+    # (needs ENABLE_EMBEDDINGS_CACHE; the first worker encodes the catalog, the rest wait and map it)
+    SHARED_EMBEDDINGS: bool = os.getenv("SHARED_EMBEDDINGS", "false").lower() == "true"
+    # Store the catalog embeddings inside the binary catalog snapshot instead of a separate .npy file
+    SNAPSHOT_EMBEDDINGS: bool = os.getenv("SNAPSHOT_EMBEDDINGS", "false").lower() == "true"
+    
+    # Query embedding cache - repeat orders skip the encoder for lines seen before
+    QUERY_CACHE_SIZE: int = int(os.getenv("QUERY_CACHE_SIZE", "20000"))  # 0 disables the cache
+    QUERY_CACHE_TTL_SECONDS: float = float(os.getenv("QUERY_CACHE_TTL_SECONDS", "604800"))  # 0 = never expire
+    QUERY_CACHE_PERSIST: bool = os.getenv("QUERY_CACHE_PERSIST", "false").lower() == "true"
+    
+    # Whole-line result cache - invalidated automatically by catalog reloads and threshold changes
+    LINE_CACHE_SIZE: int = int(os.getenv("LINE_CACHE_SIZE", "50000"))  # 0 disables the cache
+    LINE_CACHE_TTL_SECONDS: float = float(os.getenv("LINE_CACHE_TTL_SECONDS", "86400"))  # 0 = never expire
+    
+    WARMUP_ON_STARTUP: bool = os.getenv("WARMUP_ON_STARTUP", "true").lower() == "true"
+    
+    # Order processing concurrency - keeps the event loop free while orders are matched
+    PROCESSING_WORKERS: int = int(os.getenv("PROCESSING_WORKERS", "2"))
+    PROCESSING_QUEUE_LIMIT: int = int(os.getenv("PROCESSING_QUEUE_LIMIT", "8"))
+    
+    # Background jobs for large orders - polled via /jobs instead of holding the request open
+    JOB_WORKERS: int = int(os.getenv("JOB_WORKERS", "1"))
+    JOB_QUEUE_LIMIT: int = int(os.getenv("JOB_QUEUE_LIMIT", "32"))
+    JOB_RESULT_TTL_SECONDS: float = float(os.getenv("JOB_RESULT_TTL_SECONDS", "3600"))  # Finished jobs and their CSVs expire after this
+    
+    # Catalog persistence - temp/catalog.snapshot is what startup loads; the JSON files are
+    # optional human-readable exports (see view_catalog.py)
+    EXPORT_CATALOG_JSON: bool = os.getenv("EXPORT_CATALOG_JSON", "true").lower() == "true"
     
     # File Processing
     MAX_FILE_SIZE: int = int(os.getenv("MAX_FILE_SIZE", "10485760"))  # 10MB
+    UPLOAD_CHUNK_SIZE: int = int(os.getenv("UPLOAD_CHUNK_SIZE", "65536"))  # Bytes read per chunk when streaming uploads
     SUPPORTED_EXTENSIONS: List[str] = [".txt"]
+    MAX_BATCH_FILES: int = int(os.getenv("MAX_BATCH_FILES", "100"))  # Order files per batch upload, counting zip members
     
     # Paths
     BASE_DIR: Path = Path(__file__).parent
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+csvgenie-batch: match directories of order files offline, without the HTTP server
+
+Usage:
+    python csvgenie_batch.py ORDERS_DIR [MORE_DIRS_OR_GLOBS ...] --output-dir out/
+    python csvgenie_batch.py "backlog/2024-*/*.txt" --workers 8 --batch-size 128 --resume
+
+For every order file this writes <name>.csv (mapped items) and <name>.json (the full
+ProcessedOrder), plus summary.json for the whole run. <name> is the file's path relative
+to the inputs' common directory, e.g. sub__orders. With --resume, files whose <name>.json
+was written for the same path, size and mtime are skipped.
+"""
+
+import argparse
+import glob
+import json
+import logging
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# Add the backend directory to Python path
+backend_dir = Path(__file__).parent.resolve()
+sys.path.insert(0, str(backend_dir))
+
+# Set per process: one CatalogService/OrderProcessor pair shared by every file the process handles
+_order_processor = None
+
+def find_order_files(inputs: List[str]) -> List[Path]:
+    """Expand directories and glob patterns into a sorted list of .txt order files"""
+    files = set()
+    for pattern in inputs:
+        path = Path(pattern)
+        if path.is_dir():
+            files.update(path.rglob("*.txt"))
+        elif path.is_file():
+            files.add(path)
+        else:
+            files.update(Path(match) for match in glob.glob(pattern, recursive=True) if Path(match).is_file())
+    
+    return sorted(file.resolve() for file in files if file.suffix.lower() == ".txt")
+
+def assign_output_names(order_files: List[Path]) -> List[Tuple[Path, str]]:
+    """Name each file's outputs after its path relative to the files' common directory
+    
+    sub/orders.txt becomes sub__orders, so a name does not depend on which other files
+    are in the run; a counter is added only if two paths still flatten to the same name.
+    """
+    if not order_files:
+        return []
+    root = Path(os.path.commonpath([order_file.parent for order_file in order_files]))
+    seen = set()
+    named = []
+    for order_file in order_files:
+        base = "__".join(order_file.relative_to(root).with_suffix("").parts)
+        output_name, count = base, 0
+        while output_name in seen:
+            count += 1
+            output_name = f"{base}_{count}"
+        seen.add(output_name)
+        named.append((order_file, output_name))
+    return named
+
+def source_fingerprint(order_file: Path) -> Dict[str, Any]:
+    """Path, size and mtime of an order file, stored with its result so --resume can match them"""
+    stat = order_file.stat()
+    return {"path": str(order_file), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+def init_worker(batch_size: Optional[int], verbose: bool = False, torch_threads: int = 0) -> None:
+    """Load the catalog, model and catalog embeddings once per process"""
+    global _order_processor
+    
+    # Per-line parser warnings would drown the per-file progress lines
+    logging.disable(logging.NOTSET if verbose else logging.WARNING)
+    
+    if torch_threads:
+        # Must happen before torch is imported, or every worker grabs every core
+        os.environ.setdefault("OMP_NUM_THREADS", str(torch_threads))
+        os.environ.setdefault("MKL_NUM_THREADS", str(torch_threads))
+    
+    os.chdir(backend_dir)  # Catalog and CSV paths are relative to the backend directory
+    
+    from config import config
+    from services.catalog_service import CatalogService
+    from services.order_processor import OrderProcessor
+    
+    if batch_size:
+        config.BATCH_SIZE = batch_size
+    
+    catalog_service = CatalogService()
+    catalog_service.load_catalog()
+    _order_processor = OrderProcessor(catalog_service)
+    _order_processor.warm_up()
+
+def process_file(order_file: str, output_name: str, output_dir: str) -> Dict[str, Any]:
+    """Match one order file and write <output_name>.csv and <output_name>.json"""
+    from utils.streaming import iter_file_lines
+    
+    start_time = time.time()
+    record = {"file": order_file, "output_name": output_name}
+    
+    try:
+        source = source_fingerprint(Path(order_file))
+        with open(order_file, "rb") as f:
+            result = _order_processor.process_order_lines(iter_file_lines(f))
+        
+        csv_path = None
+        if result.csv_filename:
+            csv_path = Path(output_dir) / f"{output_name}.csv"
+            shutil.move(str(Path("temp") / result.csv_filename), str(csv_path))
+        
+        # The JSON is written last and atomically - its presence marks the file as done for --resume
+        json_path = Path(output_dir) / f"{output_name}.json"
+        tmp_path = json_path.with_suffix(".json.tmp")
+        payload = result.model_dump(mode="json")
+        payload["source"] = source
+        tmp_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        os.replace(tmp_path, json_path)
+        
+        record.update({
+            "status": "processed",
+            "total_items": result.total_items,
+            "mapped_count": result.mapped_count,
+            "unmapped_count": result.unmapped_count,
+            "csv": str(csv_path) if csv_path else None,
+        })
+    except Exception as e:
+        record.update({"status": "failed", "error": str(e)})
+    
+    record["processing_time_ms"] = (time.time() - start_time) * 1000
+    return record
+
+def resumed_record(order_file: Path, output_name: str, output_dir: Path) -> Optional[Dict[str, Any]]:
+    """Summarise a file finished by an earlier run, or None if it still needs processing"""
+    json_path = output_dir / f"{output_name}.json"
+    if not json_path.exists():
+        return None
+    
+    try:
+        result = json.loads(json_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None  # Unreadable result - process the file again
+    
+    try:
+        if result.get("source") != source_fingerprint(order_file):
+            return None  # Written for another file, or this file changed since
+    except OSError:
+        return None
+    
+    csv_path = output_dir / f"{output_name}.csv"
+    return {
+        "file": str(order_file),
+        "output_name": output_name,
+        "status": "skipped",
+        "total_items": result.get("total_items", 0),
+        "mapped_count": result.get("mapped_count", 0),
+        "unmapped_count": result.get("unmapped_count", 0),
+        "csv": str(csv_path) if csv_path.exists() else None,
+        "processing_time_ms": 0.0,
+    }
+
+def run(order_files: List[Tuple[Path, str]], output_dir: Path, workers: int,
+        batch_size: Optional[int], verbose: bool = False) -> List[Dict[str, Any]]:
+    """Process files in-process (workers == 1) or across a pool of worker processes"""
+    records = []
+    
+    if workers == 1 or len(order_files) == 1:
+        init_worker(batch_size, verbose)
+        for order_file, output_name in order_files:
+            records.append(report(process_file(str(order_file), output_name, str(output_dir))))
+        return records
+    
+    # Build the catalog snapshot and the on-disk embeddings cache once, in a process that
+    # exits straight after, so workers start from the cache instead of each encoding the
+    # catalog and the parent never holds a model of its own
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn"),
+                             initializer=init_worker, initargs=(batch_size, verbose)) as executor:
+        executor.submit(os.getpid).result()  # Any task: it returns once init_worker has run
+    
+    torch_threads = max(1, (os.cpu_count() or 1) // workers)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn"),
+                             initializer=init_worker, initargs=(batch_size, verbose, torch_threads)) as executor:
+        futures = [
+            executor.submit(process_file, str(order_file), output_name, str(output_dir))
+            for order_file, output_name in order_files
+        ]
+        for future in as_completed(futures):
+            records.append(report(future.result()))
+    
+    return records
+
+def report(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Print one line of progress for a finished file"""
+    if record["status"] == "failed":
+        print(f"❌ {record['file']}: {record['error']}")
+    else:
+        print(f"✅ {record['file']}: {record['mapped_count']} mapped, {record['unmapped_count']} unmapped "
+              f"({record['processing_time_ms']:.0f}ms)")
+    return record
+
+def write_summary(records: List[Dict[str, Any]], output_dir: Path, elapsed: float, workers: int) -> Dict[str, Any]:
+    """Write summary.json and print the totals"""
+    records = sorted(records, key=lambda record: record["file"])
+    done = [record for record in records if record["status"] != "failed"]
+    
+    summary = {
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "workers": workers,
+        "elapsed_seconds": elapsed,
+        "total_files": len(records),
+        "processed_files": sum(1 for record in records if record["status"] == "processed"),
+        "skipped_files": sum(1 for record in records if record["status"] == "skipped"),
+        "failed_files": len(records) - len(done),
+        "total_items": sum(record["total_items"] for record in done),
+        "mapped_count": sum(record["mapped_count"] for record in done),
+        "unmapped_count": sum(record["unmapped_count"] for record in done),
+        "files": records,
+    }
+    
+    with open(output_dir / "summary.json", "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+    
+    print("\n📊 Batch Summary")
+    print("=" * 50)
+    print(f"Files: {summary['processed_files']} processed, {summary['skipped_files']} skipped, "
+          f"{summary['failed_files']} failed")
+    print(f"Items: {summary['total_items']} total, {summary['mapped_count']} mapped, "
+          f"{summary['unmapped_count']} unmapped")
+    print(f"Time: {elapsed:.1f}s with {workers} worker(s)")
+    print(f"Report: {output_dir / 'summary.json'}")
+    return summary
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="csvgenie-batch",
+        description="Match order files against the catalog without running the API server"
+    )
+    parser.add_argument("inputs", nargs="+", help="Order files, directories (searched recursively) or glob patterns")
+    parser.add_argument("-o", "--output-dir", default="batch_output", help="Where CSVs, results and summary.json go")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes, each with its own model (default: CPU count)")
+    parser.add_argument("-b", "--batch-size", type=int, default=None,
+                        help="Lines per encoder batch (default: BATCH_SIZE from config)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Skip files that already have results in the output directory")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Show service log messages")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    
+    order_files = find_order_files(args.inputs)
+    if not order_files:
+        print("❌ No .txt order files found")
+        return 1
+    
+    output_dir = Path(args.output_dir).resolve()
+    output_dir.mkdir(parents=True, exist_ok=True)
+    workers = max(1, args.workers)
+    
+    print("🧮 CSVGenie Batch Processor")
+    print("=" * 50)
+    print(f"📄 {len(order_files)} order files → {output_dir}")
+    
+    records = []
+    pending = []
+    for order_file, output_name in assign_output_names(order_files):
+        record = resumed_record(order_file, output_name, output_dir) if args.resume else None
+        if record is not None:
+            records.append(record)
+        else:
+            pending.append((order_file, output_name))
+    
+    if args.resume:
+        print(f"⏭️  Resuming: {len(records)} already done, {len(pending)} to process")
+    
+    start_time = time.time()
+    if pending:
+        records.extend(run(pending, output_dir, min(workers, len(pending)), args.batch_size, args.verbose))
+    
+    summary = write_summary(records, output_dir, time.time() - start_time, workers)
+    return 1 if summary["failed_files"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,19 +1,29 @@
 from fastapi import FastAPI, File, UploadFile, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
-import pandas as pd
+from fastapi.responses import FileResponse, StreamingResponse
+from fastapi.encoders import jsonable_encoder
 import os
 import tempfile
 import re
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable, Iterable, Tuple
 from pathlib import Path
 import json
+import asyncio
+from datetime import datetime
+from functools import partial
+from zipfile import ZipFile
 from config import config
 from services.catalog_service import CatalogService
 from services.order_processor import OrderProcessor
-from models.schemas import ProcessedOrder, CatalogItem
+from services.processing_pool import ProcessingPool
+from services.job_manager import JobManager
+from models.schemas import ProcessedOrder, BatchProcessedOrder, CatalogItem, MappedItem, OrderSummary, JobInfo
 from utils.logger import setup_logger, get_logger
-from utils.exceptions import CSVGenieException, CatalogError, FileProcessingError
+from utils.exceptions import (
+    CSVGenieException, CatalogError, FileProcessingError, ProcessingQueueFullError,
+    JobNotFoundError, JobNotFinishedError
+)
+from utils.streaming import iter_file_lines, iter_zip_member_lines, list_zip_order_files, open_zip_archive
 
 # Set up logging
 logger = setup_logger("csvgenie.main", "DEBUG" if config.DEBUG else "INFO")
@@ -38,6 +48,10 @@ app.add_middleware(
 # Initialize services
 catalog_service = CatalogService()
 order_processor = OrderProcessor(catalog_service)
+processing_pool = ProcessingPool(config.PROCESSING_WORKERS, config.PROCESSING_QUEUE_LIMIT)
+job_manager = JobManager(order_processor, config.JOB_WORKERS, config.JOB_QUEUE_LIMIT, config.JOB_RESULT_TTL_SECONDS)
+
+CATALOG_LOADING_RETRY_AFTER_SECONDS = 5  # Sent with the 503 for orders that arrive during startup
 
 # Global exception handler
 @app.exception_handler(CSVGenieException)
@@ -54,7 +68,7 @@ async def csvgenie_exception_handler(request, exc: CSVGenieException):
         "error_code": exc.error_code,
         "message": exc.message,
         "details": exc.details,
-        "timestamp": pd.Timestamp.now().isoformat()
+        "timestamp": datetime.now().isoformat()
     }, exc.status_code
 
 @app.exception_handler(Exception)
@@ -67,7 +81,7 @@ async def general_exception_handler(request, exc: Exception):
         "error_code": "INTERNAL_ERROR",
         "message": "An unexpected error occurred",
         "details": {"type": type(exc).__name__} if config.DEBUG else {},
-        "timestamp": pd.Timestamp.now().isoformat()
+        "timestamp": datetime.now().isoformat()
     }, 500
 
 @app.on_event("startup")
@@ -78,14 +92,42 @@ async def startup_event():
         config.create_directories()
         logger.info("✅ Directories created successfully")
         
-        # Initialize services
-        catalog_service.load_catalog()
-        logger.info("✅ Catalog loaded successfully")
+        # Load the catalog and the model in the background so the port opens straight away;
+        # /health reports catalog_loaded and ready once they are done
+        asyncio.get_running_loop().run_in_executor(None, initialize_services)
         
     except Exception as e:
         logger.error(f"❌ Error during startup: {e}")
         # Don't fail startup for catalog issues - they can be handled later
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Wait for in-flight orders before the process exits"""
+    processing_pool.shutdown()
+    job_manager.shutdown()
+    
+    if config.QUERY_CACHE_PERSIST:
+        order_processor.save_query_cache()
+
+def initialize_services():
+    """Load the catalog, then warm up the order processor if enabled"""
+    try:
+        catalog_service.load_catalog()
+        logger.info("✅ Catalog loaded successfully")
+    except Exception as e:
+        logger.error(f"❌ Error loading catalog: {e}")
+        return
+    
+    if config.WARMUP_ON_STARTUP:
+        warm_up_order_processor()
+
+def warm_up_order_processor():
+    """Build catalog embeddings and prime the model before serving orders"""
+    try:
+        order_processor.warm_up()
+    except Exception as e:
+        logger.error(f"❌ Error during warm-up: {e}")
+
 @app.get("/")
 async def root():
     """Root endpoint with API information"""
@@ -107,7 +149,10 @@ async def health_check():
     return {
         "status": "healthy", 
         "catalog_loaded": catalog_service.is_loaded(),
-        "timestamp": pd.Timestamp.now().isoformat(),
+        "ready": order_processor.is_ready(),
+        "processing": processing_pool.get_stats(),
+        "jobs": job_manager.get_stats(),
+        "timestamp": datetime.now().isoformat(),
         "version": "1.0.0"
     }
 
@@ -129,7 +174,7 @@ async def get_catalog_stats():
     return {
         "catalog_loaded": True,
         "stats": stats,
-        "timestamp": pd.Timestamp.now().isoformat()
+        "timestamp": datetime.now().isoformat()
     }
 
 @app.get("/catalog/summary")
@@ -142,19 +187,24 @@ async def get_catalog_summary():
     return {
         "catalog_loaded": True,
         "summary": summary,
-        "timestamp": pd.Timestamp.now().isoformat()
+        "timestamp": datetime.now().isoformat()
     }
 
 @app.post("/catalog/reload")
 async def reload_catalog():
-    """Force reload catalog from Excel files"""
+    """Reload the catalog from Excel files, re-reading only workbooks that changed"""
     try:
-        logger.info("🔄 Force reloading catalog from Excel files...")
-        catalog_service.load_catalog()
+        logger.info("🔄 Reloading catalog from Excel files...")
+        loop = asyncio.get_running_loop()
+        changes = await loop.run_in_executor(None, catalog_service.reload_catalog)
+        
+        # Rebuild embeddings (only for added or changed items) and the vector index in the background
+        loop.run_in_executor(None, warm_up_order_processor)
+        
         return {
             "message": "Catalog reloaded successfully",
-            "total_items": len(catalog_service.get_catalog_items()),
-            "timestamp": pd.Timestamp.now().isoformat()
+            **changes,
+            "timestamp": datetime.now().isoformat()
         }
     except Exception as e:
         logger.error(f"Error reloading catalog: {e}")
@@ -177,28 +227,230 @@ async def search_catalog(query: str, limit: int = 10):
         "limit": limit
     }
 
-@app.post("/upload-order-file")
-async def upload_order_file(file: UploadFile = File(...)) -> ProcessedOrder:
-    """Process uploaded order file and return mapped results"""
+def validate_order_upload(file: UploadFile) -> None:
+    """Reject uploads without a .txt filename or over the size limit"""
     if not file.filename:
         raise HTTPException(status_code=400, detail="No file provided")
     
     if not file.filename.endswith('.txt'):
         raise HTTPException(status_code=400, detail="Only .txt files are supported")
     
+    check_upload_size(file)
+
+def check_upload_size(file: UploadFile) -> None:
+    """Reject uploads whose declared size is already over the limit"""
+    size = getattr(file, "size", None)
+    if size is not None and size > config.MAX_FILE_SIZE:
+        raise HTTPException(status_code=413, detail=f"File exceeds the maximum size of {config.MAX_FILE_SIZE} bytes")
+
+def require_catalog_loaded() -> None:
+    """Reject orders with a retryable 503 while the catalog is still loading in the background"""
+    if not catalog_service.is_loaded():
+        raise HTTPException(status_code=503, detail="Catalog is still loading, please retry shortly",
+                            headers={"Retry-After": str(CATALOG_LOADING_RETRY_AFTER_SECONDS)})
+
+def iter_upload_lines(file: UploadFile):
+    """Read an uploaded order file line by line in chunks, enforcing MAX_FILE_SIZE"""
+    file.file.seek(0)
+    return iter_file_lines(file.file, chunk_size=config.UPLOAD_CHUNK_SIZE, max_bytes=config.MAX_FILE_SIZE)
+
+def process_uploaded_order(file: UploadFile) -> ProcessedOrder:
+    """Stream an uploaded order through parse → batch-encode → match"""
+    return order_processor.process_order_lines(iter_upload_lines(file))
+
+@app.post("/upload-order-file")
+async def upload_order_file(file: UploadFile = File(...)) -> ProcessedOrder:
+    """Process uploaded order file and return mapped results"""
+    validate_order_upload(file)
+    require_catalog_loaded()
+    
     try:
-        # Read file content
-        content = await file.read()
-        text_content = content.decode('utf-8')
-        
-        # Process the order
-        result = order_processor.process_order_text(text_content)
+        # Stream the file through the matcher in the worker pool so the event loop stays responsive
+        result = await processing_pool.run(process_uploaded_order, file)
         
         return result
         
+    except (ProcessingQueueFullError, FileProcessingError) as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing file: {str(e)}")
 
+# (filename, callable opening the file's lines) for one order file of a batch upload
+OrderSource = Tuple[str, Callable[[], Iterable[str]]]
+
+def collect_batch_order_sources(files: List[UploadFile]) -> Tuple[List[OrderSource], List[ZipFile]]:
+    """Validate a batch upload and list (filename, open lines) for every .txt file and zip member
+    
+    Returns the sources and the opened zip archives, which the caller must close.
+    """
+    sources = []
+    archives = []
+    
+    try:
+        for file in files:
+            if not file.filename:
+                raise HTTPException(status_code=400, detail="No file provided")
+            
+            if file.filename.lower().endswith('.zip'):
+                file.file.seek(0)
+                archive = open_zip_archive(file.file)
+                archives.append(archive)
+                for info in list_zip_order_files(archive):
+                    sources.append((info.filename, partial(
+                        iter_zip_member_lines, archive, info,
+                        chunk_size=config.UPLOAD_CHUNK_SIZE, max_bytes=config.MAX_FILE_SIZE
+                    )))
+            elif file.filename.endswith('.txt'):
+                check_upload_size(file)
+                sources.append((file.filename, partial(iter_upload_lines, file)))
+            else:
+                raise HTTPException(status_code=400, detail=f"Only .txt and .zip files are supported: {file.filename}")
+        
+        if not sources:
+            raise HTTPException(status_code=400, detail="No .txt order files found in upload")
+        
+        if len(sources) > config.MAX_BATCH_FILES:
+            raise HTTPException(status_code=400, detail=f"Too many order files: {len(sources)} (maximum {config.MAX_BATCH_FILES})")
+        
+    except FileProcessingError as e:
+        close_archives(archives)
+        raise HTTPException(status_code=e.status_code, detail=e.message)
+    except HTTPException:
+        close_archives(archives)
+        raise
+    
+    return sources, archives
+
+def close_archives(archives: List[ZipFile]) -> None:
+    for archive in archives:
+        archive.close()
+
+def process_uploaded_orders(sources: List[OrderSource], archives: List[ZipFile]) -> BatchProcessedOrder:
+    """Run every file of a batch upload through one shared parse → batch-encode → match pass"""
+    try:
+        # Files are opened one after another as the pipeline reaches them
+        return order_processor.process_order_batch((filename, open_lines()) for filename, open_lines in sources)
+    finally:
+        close_archives(archives)
+
+@app.post("/upload-order-files")
+async def upload_order_files(files: List[UploadFile] = File(...)) -> BatchProcessedOrder:
+    """Process many order files (.txt files and/or .zip archives of them) in one request
+    
+    Lines from all files are matched together, so the encoder sees a few full batches
+    instead of one small batch per file. Returns per-file results and a combined CSV.
+    """
+    require_catalog_loaded()
+    sources, archives = collect_batch_order_sources(files)
+    
+    try:
+        return await processing_pool.run(process_uploaded_orders, sources, archives)
+        
+    except ProcessingQueueFullError as e:
+        close_archives(archives)
+        raise HTTPException(status_code=e.status_code, detail=e.message)
+    except FileProcessingError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error processing files: {str(e)}")
+
+STREAM_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "sse": "text/event-stream"
+}
+
+def order_result_record(result) -> Dict[str, Any]:
+    """Tag a streamed order result with its record type"""
+    if isinstance(result, MappedItem):
+        record_type = "mapped"
+    elif isinstance(result, OrderSummary):
+        record_type = "summary"
+    else:
+        record_type = "unmapped"
+    return {"type": record_type, **jsonable_encoder(result)}
+
+def format_stream_record(record: Dict[str, Any], stream_format: str) -> str:
+    """Serialize one record as an NDJSON line or a Server-Sent Event"""
+    data = json.dumps(record)
+    if stream_format == "sse":
+        return f"event: {record['type']}\ndata: {data}\n\n"
+    return data + "\n"
+
+@app.post("/upload-order-file/stream")
+async def upload_order_file_stream(file: UploadFile = File(...), format: str = "ndjson"):
+    """Process uploaded order file, streaming each match as soon as its batch is done
+    
+    Records are {"type": "mapped" | "unmapped", ...item fields} followed by one
+    {"type": "summary", ...} record, or {"type": "error", "detail": ...} on failure.
+    Use format=ndjson (one JSON object per line) or format=sse (Server-Sent Events).
+    """
+    if format not in STREAM_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail=f"Unsupported stream format '{format}', use 'ndjson' or 'sse'")
+    
+    validate_order_upload(file)
+    require_catalog_loaded()
+    
+    try:
+        # Reserve a worker slot before the response starts so a full queue still gets a 503
+        results = processing_pool.stream(order_processor.iter_order_results(iter_upload_lines(file)))
+    except ProcessingQueueFullError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message)
+    
+    async def stream_records():
+        try:
+            async for result in results:
+                yield format_stream_record(order_result_record(result), format)
+        except Exception as e:
+            # Headers are already sent, so report the failure in-band
+            detail = e.message if isinstance(e, FileProcessingError) else f"Error processing file: {str(e)}"
+            yield format_stream_record({"type": "error", "detail": detail}, format)
+    
+    return StreamingResponse(stream_records(), media_type=STREAM_MEDIA_TYPES[format])
+
+@app.post("/jobs", status_code=202)
+async def create_job(file: UploadFile = File(...)) -> JobInfo:
+    """Queue an order file for background processing and return the job to poll"""
+    validate_order_upload(file)
+    require_catalog_loaded()
+    
+    content = await file.read(config.MAX_FILE_SIZE + 1)
+    if len(content) > config.MAX_FILE_SIZE:
+        raise HTTPException(status_code=413, detail=f"File exceeds the maximum size of {config.MAX_FILE_SIZE} bytes")
+    
+    try:
+        return job_manager.submit(file.filename, content)
+    except ProcessingQueueFullError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message)
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str) -> JobInfo:
+    """Get job status and progress"""
+    try:
+        return job_manager.get_job(job_id)
+    except JobNotFoundError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message)
+
+@app.get("/jobs/{job_id}/result")
+async def get_job_result(job_id: str) -> ProcessedOrder:
+    """Get the processed order of a completed job"""
+    try:
+        return job_manager.get_result(job_id)
+    except (JobNotFoundError, JobNotFinishedError) as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message)
+
+@app.get("/jobs/{job_id}/result/csv")
+async def get_job_result_csv(job_id: str):
+    """Download the CSV generated by a completed job"""
+    try:
+        result = job_manager.get_result(job_id)
+    except (JobNotFoundError, JobNotFinishedError) as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message)
+    
+    if not result.csv_filename:
+        raise HTTPException(status_code=404, detail="Job produced no CSV file")
+    
+    return await download_csv(result.csv_filename)
+
 @app.get("/download-csv/{filename}")
 async def download_csv(filename: str):
     """Download processed CSV file"""
@@ -0,0 +1,210 @@
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from models.schemas import CatalogItem
+
+class CatalogRow(NamedTuple):
+    """Plain tuple view of one catalog row, with the same fields as CatalogItem"""
+    item_code: str
+    item_name: str
+    category: str
+    source_file: str
+    sheet_name: str
+
+class StringColumn:
+    """Immutable strings packed into one UTF-8 buffer and sliced by row offsets"""
+    
+    __slots__ = ("data", "offsets")
+    
+    def __init__(self, data: bytes, offsets: np.ndarray):
+        self.data = data
+        self.offsets = offsets
+    
+    @classmethod
+    def from_strings(cls, strings: Iterable[str]) -> "StringColumn":
+        encoded = [value.encode("utf-8") for value in strings]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum(np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded)), out=offsets[1:])
+        return cls(b"".join(encoded), offsets)
+    
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray], name: str) -> "StringColumn":
+        return cls(arrays[f"{name}.data"].tobytes(), arrays[f"{name}.offsets"])
+    
+    def to_arrays(self, name: str) -> Dict[str, np.ndarray]:
+        return {f"{name}.data": np.frombuffer(self.data, dtype=np.uint8), f"{name}.offsets": self.offsets}
+    
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+    
+    def __getitem__(self, position: int) -> str:
+        return self.data[self.offsets[position]:self.offsets[position + 1]].decode("utf-8")
+    
+    def tolist(self) -> List[str]:
+        bounds = self.offsets.tolist()
+        text = self.data.decode("utf-8")
+        if len(text) == len(self.data):
+            # Pure ASCII, so byte offsets are also character offsets
+            return [text[start:end] for start, end in zip(bounds, bounds[1:])]
+        data = self.data
+        return [data[start:end].decode("utf-8") for start, end in zip(bounds, bounds[1:])]
+    
+    @property
+    def nbytes(self) -> int:
+        return len(self.data) + self.offsets.nbytes
+
+class CategoryColumn:
+    """Dictionary-encoded strings: distinct values in first-seen order plus an int32 code per row"""
+    
+    __slots__ = ("values", "codes")
+    
+    def __init__(self, values: List[str], codes: np.ndarray):
+        self.values = values
+        self.codes = codes
+    
+    @classmethod
+    def from_strings(cls, strings: Iterable[str]) -> "CategoryColumn":
+        lookup: Dict[str, int] = {}
+        codes = np.fromiter((lookup.setdefault(value, len(lookup)) for value in strings), dtype=np.int32)
+        return cls(list(lookup), codes)
+    
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray], name: str) -> "CategoryColumn":
+        return cls(StringColumn.from_arrays(arrays, f"{name}.values").tolist(), arrays[f"{name}.codes"])
+    
+    def to_arrays(self, name: str) -> Dict[str, np.ndarray]:
+        arrays = StringColumn.from_strings(self.values).to_arrays(f"{name}.values")
+        arrays[f"{name}.codes"] = self.codes
+        return arrays
+    
+    def __len__(self) -> int:
+        return len(self.codes)
+    
+    def __getitem__(self, position: int) -> str:
+        return self.values[self.codes[position]]
+    
+    def tolist(self) -> List[str]:
+        values = self.values
+        return [values[code] for code in self.codes.tolist()]
+    
+    def counts(self) -> Dict[str, int]:
+        """Rows per distinct value, in first-seen order"""
+        counts = np.bincount(self.codes, minlength=len(self.values)).tolist()
+        return {value: count for value, count in zip(self.values, counts) if count}
+    
+    @property
+    def nbytes(self) -> int:
+        return self.codes.nbytes + sum(len(value.encode("utf-8")) for value in self.values)
+
+class CatalogStore:
+    """Read-only columnar catalog: one packed column per CatalogItem field
+    
+    Codes and names are UTF-8 buffers with offsets; category, source file and sheet
+    are dictionary-encoded. CatalogItem models are only built on request, for the
+    rows an API response or match result actually needs.
+    """
+    
+    __slots__ = ("item_codes", "item_names", "categories", "source_files", "sheet_names")
+    
+    def __init__(self, item_codes: StringColumn, item_names: StringColumn, categories: CategoryColumn,
+                 source_files: CategoryColumn, sheet_names: CategoryColumn):
+        self.item_codes = item_codes
+        self.item_names = item_names
+        self.categories = categories
+        self.source_files = source_files
+        self.sheet_names = sheet_names
+    
+    @classmethod
+    def from_columns(cls, item_codes: Sequence[str], item_names: Sequence[str], categories: Sequence[str],
+                     source_files: Sequence[str], sheet_names: Sequence[str]) -> "CatalogStore":
+        """Build from already-validated per-field string sequences of equal length"""
+        return cls(
+            StringColumn.from_strings(item_codes),
+            StringColumn.from_strings(item_names),
+            CategoryColumn.from_strings(categories),
+            CategoryColumn.from_strings(source_files),
+            CategoryColumn.from_strings(sheet_names)
+        )
+    
+    @classmethod
+    def from_rows(cls, rows: Iterable[CatalogRow]) -> "CatalogStore":
+        """Build from CatalogRow tuples, e.g. rows spliced together from several stores"""
+        columns = list(zip(*rows))
+        return cls.from_columns(*columns) if columns else cls.empty()
+    
+    @classmethod
+    def from_records(cls, records: Sequence[Dict[str, Any]]) -> "CatalogStore":
+        """Build from catalog.json item dicts; missing category, source or sheet become 'Unknown'"""
+        return cls.from_columns(
+            [record['item_code'] for record in records],
+            [record['item_name'] for record in records],
+            [record.get('category', 'Unknown') for record in records],
+            [record.get('source_file', 'Unknown') for record in records],
+            [record.get('sheet_name', 'Unknown') for record in records]
+        )
+    
+    @classmethod
+    def from_items(cls, items: Sequence[CatalogItem]) -> "CatalogStore":
+        return cls.from_columns(
+            [item.item_code for item in items],
+            [item.item_name for item in items],
+            [item.category for item in items],
+            [item.source_file for item in items],
+            [item.sheet_name for item in items]
+        )
+    
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray]) -> "CatalogStore":
+        """Rebuild from to_arrays() output (e.g. a snapshot) without touching individual rows"""
+        return cls(
+            StringColumn.from_arrays(arrays, "item_codes"),
+            StringColumn.from_arrays(arrays, "item_names"),
+            CategoryColumn.from_arrays(arrays, "categories"),
+            CategoryColumn.from_arrays(arrays, "source_files"),
+            CategoryColumn.from_arrays(arrays, "sheet_names")
+        )
+    
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """Every column as flat NumPy arrays, keyed by '<column>.<part>'"""
+        arrays: Dict[str, np.ndarray] = {}
+        for name in self.__slots__:
+            arrays.update(getattr(self, name).to_arrays(name))
+        return arrays
+    
+    @classmethod
+    def empty(cls) -> "CatalogStore":
+        return cls.from_columns([], [], [], [], [])
+    
+    def __len__(self) -> int:
+        return len(self.item_codes)
+    
+    def item(self, position: int) -> CatalogItem:
+        """Materialize one row as a CatalogItem"""
+        return CatalogItem(
+            item_code=self.item_codes[position],
+            item_name=self.item_names[position],
+            category=self.categories[position],
+            source_file=self.source_files[position],
+            sheet_name=self.sheet_names[position]
+        )
+    
+    def items(self, positions: Optional[Iterable[int]] = None) -> List[CatalogItem]:
+        """Materialize the given rows (all rows by default) as CatalogItems"""
+        if positions is None:
+            return [CatalogItem(**row._asdict()) for row in self.rows()]
+        return [self.item(position) for position in positions]
+    
+    def rows(self) -> Iterator[CatalogRow]:
+        """Iterate every row as a lightweight CatalogRow tuple"""
+        columns = (self.item_codes, self.item_names, self.categories, self.source_files, self.sheet_names)
+        return map(CatalogRow._make, zip(*(column.tolist() for column in columns)))
+    
+    def to_records(self) -> List[Dict[str, str]]:
+        """Rows as catalog.json item dicts"""
+        return [row._asdict() for row in self.rows()]
+    
+    @property
+    def nbytes(self) -> int:
+        return sum(column.nbytes for column in
+                   (self.item_codes, self.item_names, self.categories, self.source_files, self.sheet_names))
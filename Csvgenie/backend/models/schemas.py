@@ -90,6 +90,50 @@ class ProcessedOrder(BaseModel):
             }
         }
 
+class OrderSummary(BaseModel):
+    """Totals for a processed order, sent as the final record of a streamed order"""
+    total_items: int = Field(..., ge=0, description="Total number of items processed")
+    mapped_count: int = Field(..., ge=0, description="Number of successfully mapped items")
+    unmapped_count: int = Field(..., ge=0, description="Number of unmapped items")
+    csv_filename: Optional[str] = Field(None, max_length=200, description="Generated CSV filename for download")
+    processing_time_ms: float = Field(..., ge=0, description="Processing time in milliseconds")
+
+class BatchFileResult(BaseModel):
+    """Processed order for one file of a batch upload"""
+    filename: str = Field(..., description="Order file name")
+    result: ProcessedOrder = Field(..., description="Processed order for this file")
+
+class BatchProcessedOrder(BaseModel):
+    """Represents the results of processing several order files together"""
+    orders: List[BatchFileResult] = Field(..., description="Per-file results, in upload order")
+    total_files: int = Field(..., ge=0, description="Number of order files processed")
+    total_items: int = Field(..., ge=0, description="Total number of items processed across all files")
+    mapped_count: int = Field(..., ge=0, description="Number of successfully mapped items across all files")
+    unmapped_count: int = Field(..., ge=0, description="Number of unmapped items across all files")
+    combined_csv_filename: Optional[str] = Field(None, max_length=200, description="CSV of all mapped items with their source file")
+    processing_time_ms: float = Field(..., ge=0, description="Processing time in milliseconds")
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+class JobInfo(BaseModel):
+    """Status and progress of a background order processing job"""
+    job_id: str = Field(..., description="Job identifier")
+    status: JobStatus = Field(..., description="Current job status")
+    filename: str = Field(..., description="Uploaded order file name")
+    total_lines: int = Field(0, ge=0, description="Order lines to parse and match")
+    processed_lines: int = Field(0, ge=0, description="Lines parsed and matched so far")
+    mapped_count: int = Field(0, ge=0, description="Lines mapped so far")
+    unmapped_count: int = Field(0, ge=0, description="Lines left unmapped so far")
+    created_at: str = Field(..., description="When the job was queued (ISO 8601)")
+    started_at: Optional[str] = Field(None, description="When processing started (ISO 8601)")
+    finished_at: Optional[str] = Field(None, description="When processing finished (ISO 8601)")
+    expires_at: Optional[str] = Field(None, description="When the result will be discarded (ISO 8601)")
+    error: Optional[str] = Field(None, description="Error message if the job failed")
+
 class OrderProcessingRequest(BaseModel):
     """Request model for order processing"""
     text_content: str = Field(..., description="Text content to process")
@@ -0,0 +1,241 @@
+import re
+import time
+import logging
+from bisect import bisect_left
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+
+from models.catalog_store import CatalogStore, StringColumn
+from models.schemas import CatalogItem
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+_TOKEN_PATTERN = re.compile(r'\w+')
+_NGRAM = 3
+_SHORT_NGRAM = 2  # Two-character queries (the shortest /catalog/search accepts) use bigrams
+_CODE_BITS = 21  # Enough for any Unicode code point
+_SEPARATOR = "\x00"  # Never part of an item name, so no n-gram spans two names
+
+def _ngram_codes(text: str, n: int = _NGRAM) -> np.ndarray:
+    """Pack each run of n code points into one int64 (21 bits per code point)"""
+    codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32).astype(np.int64)
+    count = len(codes) - n + 1
+    if count <= 0:
+        return np.empty(0, dtype=np.int64)
+    packed = codes[:count].copy()
+    for i in range(1, n):
+        packed = (packed << _CODE_BITS) | codes[i:i + count]
+    return packed
+
+def _sorted_by_text(texts: List[str]) -> np.ndarray:
+    """Positions of texts in lexicographic order"""
+    if not texts:
+        return np.empty(0, dtype=np.int64)
+    return np.argsort(np.array(texts), kind="stable")
+
+def _prefix_range(sorted_keys: List[str], prefix: str) -> Iterator[int]:
+    """Yield positions in sorted_keys of every key starting with prefix, in order"""
+    position = bisect_left(sorted_keys, prefix)
+    while position < len(sorted_keys) and sorted_keys[position].startswith(prefix):
+        yield position
+        position += 1
+
+class CatalogSearchIndex:
+    """Immutable in-memory lookup indexes over one catalog snapshot
+    
+    Holds the item code -> positions map and the name search index together, so a
+    reload swaps both at once and no reader sees codes from one catalog and items
+    from another.
+    
+    Name search results are ranked: exact name, then names starting with the query
+    (alphabetical), then names with a word starting with the query (grouped by that word
+    in alphabetical order, catalog order within a word), then any other name containing
+    the query (catalog order). Each tier stops as soon as `limit` is reached, and
+    substring candidates come from intersecting trigram posting lists, or the bigram
+    list for two-character queries.
+    """
+    
+    def __init__(self, store: CatalogStore, arrays: Optional[Dict[str, np.ndarray]] = None):
+        """Index store, or restore the name indexes from to_arrays() output instead of rebuilding"""
+        start_time = time.time()
+        self.store = store
+        self.names = [name.lower() for name in store.item_names.tolist()]
+        
+        # The same ITEM# can appear in several sheets, so each code keeps every position
+        self.code_positions: Dict[str, List[int]] = {}
+        for position, item_code in enumerate(store.item_codes.tolist()):
+            positions = self.code_positions.get(item_code)
+            if positions is None:
+                self.code_positions[item_code] = [position]
+            else:
+                positions.append(position)
+        
+        if arrays is None:
+            self._build_name_indexes()
+        else:
+            self._restore_name_indexes(arrays)
+        
+        self.build_time_ms = (time.time() - start_time) * 1000
+        if len(store):
+            action = "Built" if arrays is None else "Restored"
+            logger.info(f"✅ {action} catalog search index: {len(store)} items, "
+                        f"{len(self.trigram_codes)} trigrams ({self.build_time_ms:.0f}ms)")
+    
+    def _build_name_indexes(self) -> None:
+        name_order = _sorted_by_text(self.names).tolist()
+        self.sorted_names = [self.names[position] for position in name_order]
+        self.sorted_name_positions = name_order
+        
+        token_postings: Dict[str, List[int]] = {}
+        for position, name in enumerate(self.names):
+            for token in set(_TOKEN_PATTERN.findall(name)):
+                positions = token_postings.get(token)
+                if positions is None:
+                    token_postings[token] = [position]
+                else:
+                    positions.append(position)
+        self.sorted_tokens = sorted(token_postings)
+        
+        # Same CSR layout as the trigrams: token i owns token_positions[offsets[i]:offsets[i + 1]]
+        self.token_offsets = np.zeros(len(self.sorted_tokens) + 1, dtype=np.int64)
+        np.cumsum([len(token_postings[token]) for token in self.sorted_tokens], out=self.token_offsets[1:])
+        self.token_positions = np.fromiter(
+            (position for token in self.sorted_tokens for position in token_postings[token]),
+            dtype=np.int32, count=int(self.token_offsets[-1]))
+        
+        self.trigram_codes, self.trigram_offsets, self.trigram_positions = self._build_ngram_postings(_NGRAM)
+        self.bigram_codes, self.bigram_offsets, self.bigram_positions = self._build_ngram_postings(_SHORT_NGRAM)
+    
+    def _build_ngram_postings(self, n: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Posting lists as one CSR-style layout: sorted n-gram codes, offsets, positions"""
+        joined = _SEPARATOR.join(self.names)
+        grams = _ngram_codes(joined, n)
+        lengths = np.array([len(name) + 1 for name in self.names], dtype=np.int64)
+        owners = np.repeat(np.arange(len(self.names), dtype=np.int32), lengths)[:len(grams)]
+        
+        separator = ord(_SEPARATOR)
+        mask = (1 << _CODE_BITS) - 1
+        valid = np.ones(len(grams), dtype=bool)
+        for i in range(n):
+            valid &= ((grams >> (_CODE_BITS * i)) & mask) != separator
+        grams, owners = grams[valid], owners[valid]
+        
+        # Owners are ascending already, so a stable sort by n-gram keeps each posting list
+        # in catalog order; then drop repeats of an n-gram within one name
+        order = np.argsort(grams, kind="stable")
+        grams, owners = grams[order], owners[order]
+        keep = np.ones(len(grams), dtype=bool)
+        keep[1:] = (grams[1:] != grams[:-1]) | (owners[1:] != owners[:-1])
+        grams, owners = grams[keep], owners[keep]
+        
+        new_gram = np.ones(len(grams), dtype=bool)
+        new_gram[1:] = grams[1:] != grams[:-1]
+        starts = np.flatnonzero(new_gram)
+        return grams[starts], np.append(starts, len(grams)), owners
+    
+    def _restore_name_indexes(self, arrays: Dict[str, np.ndarray]) -> None:
+        self.sorted_name_positions = arrays["search.name_order"].tolist()
+        self.sorted_names = [self.names[position] for position in self.sorted_name_positions]
+        
+        self.sorted_tokens = StringColumn.from_arrays(arrays, "search.tokens").tolist()
+        self.token_offsets = arrays["search.token_offsets"]
+        self.token_positions = arrays["search.token_positions"]
+        
+        self.trigram_codes = arrays["search.trigram_codes"]
+        self.trigram_offsets = arrays["search.trigram_offsets"]
+        self.trigram_positions = arrays["search.trigram_positions"]
+        
+        self.bigram_codes = arrays["search.bigram_codes"]
+        self.bigram_offsets = arrays["search.bigram_offsets"]
+        self.bigram_positions = arrays["search.bigram_positions"]
+    
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """The name indexes as flat NumPy arrays, keyed by 'search.<part>'"""
+        arrays = StringColumn.from_strings(self.sorted_tokens).to_arrays("search.tokens")
+        arrays.update({
+            "search.name_order": np.array(self.sorted_name_positions, dtype=np.int32),
+            "search.token_offsets": self.token_offsets,
+            "search.token_positions": self.token_positions,
+            "search.trigram_codes": self.trigram_codes,
+            "search.trigram_offsets": self.trigram_offsets,
+            "search.trigram_positions": self.trigram_positions,
+            "search.bigram_codes": self.bigram_codes,
+            "search.bigram_offsets": self.bigram_offsets,
+            "search.bigram_positions": self.bigram_positions
+        })
+        return arrays
+    
+    def __len__(self) -> int:
+        return len(self.store)
+    
+    def get_by_code(self, item_code: str) -> List[CatalogItem]:
+        """Every item with this code, in catalog order"""
+        return self._items(self.code_positions.get(item_code.strip(), []))
+    
+    def get_by_codes(self, item_codes: Iterable[str]) -> Dict[str, List[CatalogItem]]:
+        """Resolve many codes at once; unknown codes map to an empty list"""
+        return {item_code: self.get_by_code(item_code) for item_code in item_codes}
+    
+    def search(self, query: str, limit: int = 10) -> List[CatalogItem]:
+        """Find up to `limit` items whose name contains query (case-insensitive), best first"""
+        query = query.lower()
+        if not query or limit <= 0:
+            return []
+        
+        found: List[int] = []
+        seen: Set[int] = set()
+        
+        def add(positions) -> bool:
+            for position in positions:
+                if position not in seen:
+                    seen.add(position)
+                    found.append(position)
+                    if len(found) >= limit:
+                        return True
+            return False
+        
+        # Names starting with the query; the exact name sorts first within the range
+        if add(self.sorted_name_positions[i] for i in _prefix_range(self.sorted_names, query)):
+            return self._items(found)
+        
+        # Names with a later word starting with the query
+        if add(position for i in _prefix_range(self.sorted_tokens, query)
+               for position in self.token_positions[self.token_offsets[i]:self.token_offsets[i + 1]].tolist()):
+            return self._items(found)
+        
+        # Any other name containing the query
+        add(position for position in self._substring_candidates(query) if query in self.names[position])
+        return self._items(found)
+    
+    def _substring_candidates(self, query: str) -> Iterator[int]:
+        """Positions that may contain query, in catalog order"""
+        if len(query) < _SHORT_NGRAM:
+            # Single characters have no posting list; /catalog/search rejects them anyway
+            return iter(range(len(self.names)))
+        
+        if len(query) < _NGRAM:
+            n, gram_codes, gram_offsets, gram_positions = (
+                _SHORT_NGRAM, self.bigram_codes, self.bigram_offsets, self.bigram_positions)
+        else:
+            n, gram_codes, gram_offsets, gram_positions = (
+                _NGRAM, self.trigram_codes, self.trigram_offsets, self.trigram_positions)
+        
+        codes = np.unique(_ngram_codes(query, n))
+        slots = np.searchsorted(gram_codes, codes)
+        # An n-gram no name contains rules out every item
+        if np.any(slots >= len(gram_codes)) or np.any(gram_codes[slots] != codes):
+            return iter(())
+        
+        postings = [gram_positions[gram_offsets[slot]:gram_offsets[slot + 1]] for slot in slots]
+        postings.sort(key=len)
+        candidates = postings[0]
+        for posting in postings[1:]:
+            candidates = np.intersect1d(candidates, posting, assume_unique=True)
+            if not len(candidates):
+                break
+        return iter(candidates.tolist())
+    
+    def _items(self, positions: List[int]) -> List[CatalogItem]:
+        return self.store.items(positions)
@@ -1,10 +1,22 @@
-import pandas as pd
 import os
 import json
+import hashlib
+import threading
+from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import TYPE_CHECKING, Iterable, List, Dict, Any, Optional
 import logging
+import numpy as np
+from config import config
+from models.catalog_store import CatalogStore
 from models.schemas import CatalogItem
+from services.catalog_search import CatalogSearchIndex
+from utils.snapshot import read_snapshot, write_snapshot
+
+if TYPE_CHECKING:
+    import pandas as pd  # Imported lazily below - only rebuilding from Excel needs it
+
+CATALOG_SNAPSHOT_VERSION = 2  # Bump whenever the arrays written by save_catalog_snapshot change
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -13,66 +25,53 @@ class CatalogService:
     """Service for managing the product catalog from Excel files"""
     
     def __init__(self):
-        self.catalog: List[CatalogItem] = []
-        self.catalog_df: Optional[pd.DataFrame] = None
+        self.store = CatalogStore.empty()  # Columnar catalog; CatalogItems are built only for responses
+        self.catalog_df: Optional["pd.DataFrame"] = None
         self.is_loaded_flag = False
+        self.catalog_version = 0  # Bumped on every successful load so dependents can rebuild
+        self.search_index = CatalogSearchIndex(self.store)  # Code and name lookups; replaced wholesale on every load
         self.tests_folder = Path("catalog")  # Use local catalog directory
-        self.catalog_file = Path("temp/catalog.json")  # Persistent catalog storage
+        self.catalog_file = Path("temp/catalog.json")  # JSON export, still read if no snapshot exists
+        self.snapshot_file = Path("temp/catalog.snapshot")  # Persistent catalog storage
+        self.workbook_fingerprints: Dict[str, Dict[str, Any]] = {}  # File name -> size, mtime and hash it was read at
+        self._reload_lock = threading.Lock()
+        self._snapshot_lock = threading.Lock()  # Reloads and embedding rebuilds may save concurrently
+        self._snapshot_embeddings: Optional[np.ndarray] = None  # Last embeddings written to the snapshot...
+        self._snapshot_embeddings_key: Optional[str] = None  # ...and the key they were saved under
         
     def load_catalog(self) -> None:
         """Load and merge all Excel files from the tests folder"""
-        # First try to load from existing JSON file
+        # First try the binary snapshot, then an existing JSON file
+        if self.load_catalog_snapshot():
+            logger.info("✅ Catalog loaded from existing snapshot")
+            return
+        
         if self.load_catalog_from_json():
             logger.info("✅ Catalog loaded from existing JSON file")
+            self.save_catalog_snapshot()
             return
         
         logger.info("🔄 No existing catalog found, loading from Excel files...")
         
+        import pandas as pd
+        
         try:
             logger.info("Starting catalog loading process...")
             
-            if not self.tests_folder.exists():
-                logger.error(f"Tests folder not found: {self.tests_folder}")
-                raise FileNotFoundError(f"Tests folder not found: {self.tests_folder}")
-            
-            excel_files = list(self.tests_folder.glob("*.xlsx"))
-            logger.info(f"Found {len(excel_files)} Excel files: {[f.name for f in excel_files]}")
-            
+            excel_files = self._find_workbooks()
             if not excel_files:
                 logger.warning("No Excel files found in tests folder")
                 return
             
             # Load and merge all Excel files
             all_dataframes = []
+            fingerprints: Dict[str, Dict[str, Any]] = {}
             
             for excel_file in excel_files:
                 try:
-                    logger.info(f"Processing file: {excel_file.name}")
-                    
-                    # Read all sheets from Excel file
-                    excel = pd.ExcelFile(excel_file)
-                    sheet_names = excel.sheet_names
-                    logger.info(f"  Found {len(sheet_names)} sheets: {sheet_names}")
-                    
-                    for sheet_name in sheet_names:
-                        try:
-                            # Read specific sheet
-                            df = pd.read_excel(excel_file, sheet_name=sheet_name, header=0)
-                            logger.info(f"  Sheet '{sheet_name}': {len(df)} rows")
-                            
-                            # Standardize column names
-                            df = self._standardize_columns(df)
-                            
-                            # Add source file and sheet information
-                            df['source_file'] = excel_file.name
-                            df['sheet_name'] = sheet_name
-                            
-                            all_dataframes.append(df)
-                            
-                        except Exception as e:
-                            logger.error(f"  ❌ Error processing sheet '{sheet_name}' in {excel_file.name}: {e}")
-                            continue
-                    
+                    fingerprint = self._fingerprint_workbook(excel_file)
+                    all_dataframes.extend(self._read_workbook(excel_file))
+                    fingerprints[excel_file.name] = fingerprint
                 except Exception as e:
                     logger.error(f"Error loading {excel_file.name}: {e}")
                     continue
@@ -85,23 +84,171 @@ class CatalogService:
             logger.info(f"Total rows after merging: {len(self.catalog_df)}")
             
             # Clean and standardize the data
-            self._clean_catalog_data()
+            self.catalog_df = self._clean_catalog_data(self.catalog_df)
             
-            # Convert to CatalogItem objects
-            self._convert_to_catalog_items()
+            # Pack the validated rows into the columnar store
+            store = self._build_catalog_store(self.catalog_df)
+            self._publish_catalog(store, CatalogSearchIndex(store), fingerprints)
             
-            # Save catalog to JSON for persistence
-            self._save_catalog_to_json()
+            # Save catalog for persistence
+            self.save_catalog_snapshot()
+            if config.EXPORT_CATALOG_JSON:
+                self._save_catalog_to_json()
             
-            self.is_loaded_flag = True
-            logger.info(f"Catalog loaded successfully with {len(self.catalog)} items")
+            logger.info(f"Catalog loaded successfully with {len(self.store)} items")
             
         except Exception as e:
             logger.error(f"Error loading catalog: {e}")
             raise
     
-    def _standardize_columns(self, df: pd.DataFrame) -> pd.DataFrame:
+    def reload_catalog(self) -> Dict[str, Any]:
+        """Re-read only the workbooks whose fingerprint changed and splice their rows into the catalog
+        
+        Rows from unchanged workbooks are copied from the current store; a workbook that
+        fails to parse keeps its previous rows. Nothing is republished when no workbook
+        was added, changed or removed, so dependents keep their embeddings.
+        """
+        import pandas as pd
+        
+        with self._reload_lock:
+            if not self.is_loaded_flag:
+                self.load_catalog()
+            
+            excel_files = self._find_workbooks()
+            previous = self.workbook_fingerprints
+            fingerprints: Dict[str, Dict[str, Any]] = {}
+            to_parse: List[Path] = []
+            for excel_file in excel_files:
+                fingerprint = self._fingerprint_workbook(excel_file, previous.get(excel_file.name))
+                fingerprints[excel_file.name] = fingerprint
+                known = previous.get(excel_file.name)
+                if known is None or known['sha256'] != fingerprint['sha256']:
+                    to_parse.append(excel_file)
+            
+            summary: Dict[str, Any] = {
+                "added": [f.name for f in to_parse if f.name not in previous],
+                "changed": [f.name for f in to_parse if f.name in previous],
+                "removed": [name for name in previous if name not in fingerprints],
+                "unchanged": len(excel_files) - len(to_parse),
+                "failed": []
+            }
+            
+            if not to_parse and not summary["removed"]:
+                if fingerprints != previous:
+                    # Only mtimes moved (e.g. a touch) - remember them so the next reload skips hashing
+                    self.workbook_fingerprints = fingerprints
+                    self.save_catalog_snapshot()
+                logger.info(f"✅ Catalog unchanged: {len(excel_files)} workbooks match their fingerprints")
+                summary["total_items"] = len(self.store)
+                return summary
+            
+            logger.info(f"🔄 Re-reading {len(to_parse)} of {len(excel_files)} workbooks: {[f.name for f in to_parse]}")
+            
+            parsed_rows: Dict[str, list] = {}
+            parsed_dataframes = []
+            for excel_file in to_parse:
+                try:
+                    dataframes = self._read_workbook(excel_file)
+                except Exception as e:
+                    logger.error(f"Error loading {excel_file.name}, keeping its previous rows: {e}")
+                    summary["failed"].append(excel_file.name)
+                    if excel_file.name in previous:
+                        fingerprints[excel_file.name] = previous[excel_file.name]
+                    else:
+                        del fingerprints[excel_file.name]
+                    continue
+                parsed_rows[excel_file.name] = []
+                parsed_dataframes.extend(dataframes)
+            
+            if parsed_dataframes:
+                df = self._clean_catalog_data(pd.concat(parsed_dataframes, ignore_index=True))
+                for row in self._build_catalog_store(df).rows():
+                    parsed_rows[row.source_file].append(row)
+            
+            # Splice: workbooks in folder order, fresh rows for the re-read ones, the
+            # current rows for the rest; workbooks no longer in the folder drop out
+            current_rows: Dict[str, list] = {}
+            for row in self.store.rows():
+                current_rows.setdefault(row.source_file, []).append(row)
+            
+            rows = []
+            for excel_file in excel_files:
+                rows.extend(parsed_rows.get(excel_file.name, current_rows.get(excel_file.name, [])))
+            
+            store = CatalogStore.from_rows(rows)
+            self._publish_catalog(store, CatalogSearchIndex(store), fingerprints)
+            self.catalog_df = None  # Only a full Excel load keeps the merged DataFrame
+            
+            self.save_catalog_snapshot()
+            if config.EXPORT_CATALOG_JSON:
+                self._save_catalog_to_json()
+            
+            summary["total_items"] = len(store)
+            logger.info(f"✅ Catalog reloaded: {len(summary['added'])} added, {len(summary['changed'])} changed, "
+                        f"{len(summary['removed'])} removed, {summary['unchanged']} unchanged workbooks, "
+                        f"{len(store)} items")
+            return summary
+    
+    def _find_workbooks(self) -> List[Path]:
+        """List the catalog workbooks in the tests folder"""
+        if not self.tests_folder.exists():
+            logger.error(f"Tests folder not found: {self.tests_folder}")
+            raise FileNotFoundError(f"Tests folder not found: {self.tests_folder}")
+        
+        excel_files = list(self.tests_folder.glob("*.xlsx"))
+        logger.info(f"Found {len(excel_files)} Excel files: {[f.name for f in excel_files]}")
+        return excel_files
+    
+    @staticmethod
+    def _fingerprint_workbook(excel_file: Path, previous: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Size, mtime and SHA-256 of a workbook; the hash is reused while size and mtime match"""
+        stat = excel_file.stat()
+        if previous is not None and previous['size'] == stat.st_size and previous['mtime_ns'] == stat.st_mtime_ns:
+            return previous
+        
+        digest = hashlib.sha256()
+        with open(excel_file, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': digest.hexdigest()}
+    
+    def _read_workbook(self, excel_file: Path) -> List["pd.DataFrame"]:
+        """Read every sheet of one workbook into standardized DataFrames"""
+        import pandas as pd
+        
+        logger.info(f"Processing file: {excel_file.name}")
+        
+        # Read all sheets from Excel file
+        excel = pd.ExcelFile(excel_file)
+        sheet_names = excel.sheet_names
+        logger.info(f"  Found {len(sheet_names)} sheets: {sheet_names}")
+        
+        dataframes = []
+        for sheet_name in sheet_names:
+            try:
+                # Read specific sheet
+                df = pd.read_excel(excel, sheet_name=sheet_name, header=0)
+                logger.info(f"  Sheet '{sheet_name}': {len(df)} rows")
+                
+                # Standardize column names
+                df = self._standardize_columns(df)
+                
+                # Add source file and sheet information
+                df['source_file'] = excel_file.name
+                df['sheet_name'] = sheet_name
+                
+                dataframes.append(df)
+                
+            except Exception as e:
+                logger.error(f"  ❌ Error processing sheet '{sheet_name}' in {excel_file.name}: {e}")
+                continue
+        
+        return dataframes
+    
+    def _standardize_columns(self, df: "pd.DataFrame") -> "pd.DataFrame":
         """Standardize column names across different Excel files"""
+        import pandas as pd
+        
         logger.info(f"Standardizing columns for DataFrame with columns: {df.columns.tolist()}")
         
         # Create a mapping of common column variations based on actual Excel files
@@ -182,169 +329,143 @@ class CatalogService:
         logger.info(f"Final columns after standardization: {df.columns.tolist()}")
         return df
     
-    def _clean_catalog_data(self) -> None:
-        """Clean and standardize the catalog data"""
-        if self.catalog_df is None:
-            return
-        
+    def _clean_catalog_data(self, df: "pd.DataFrame") -> "pd.DataFrame":
+        """Clean and standardize merged catalog rows (row by row, so any subset of workbooks can be cleaned alone)"""
         logger.info("Starting catalog data cleaning...")
         
         # Remove rows where item_name is empty or just whitespace
-        initial_count = len(self.catalog_df)
-        self.catalog_df = self.catalog_df[
-            (self.catalog_df['item_name'].notna()) & 
-            (self.catalog_df['item_name'].astype(str).str.strip().str.len() > 0)
+        initial_count = len(df)
+        df = df[
+            (df['item_name'].notna()) & 
+            (df['item_name'].astype(str).str.strip().str.len() > 0)
         ]
-        logger.info(f"Removed {initial_count - len(self.catalog_df)} rows with empty item names")
+        logger.info(f"Removed {initial_count - len(df)} rows with empty item names")
         
         # Remove rows where item_name is just the header or category labels
         header_patterns = ['ITEM#', 'ITEM DESCRIPTION', 'ORDER', 'CATEGORY', 'BRAND']
         category_patterns = ['PRODUCE BAGS', 'OTHER ESSENTIALS', 'COOKING OIL & GHEE', 'GRAIN MARKET']
         
         # Remove header rows and category labels
-        self.catalog_df = self.catalog_df[
+        df = df[
             ~(
-                self.catalog_df['item_name'].astype(str).str.upper().isin(header_patterns) |
-                self.catalog_df['item_name'].astype(str).str.upper().isin([p.upper() for p in category_patterns])
+                df['item_name'].astype(str).str.upper().isin(header_patterns) |
+                df['item_name'].astype(str).str.upper().isin([p.upper() for p in category_patterns])
             )
         ]
-        logger.info(f"Removed header rows and category labels, remaining: {len(self.catalog_df)} items")
+        logger.info(f"Removed header rows and category labels, remaining: {len(df)} items")
         
         # Don't remove duplicates - each instance should be counted separately
         # This allows the same ITEM# to exist in multiple categories/sheets
         logger.info(f"Keeping all instances - same ITEM# can exist in multiple categories")
         
         # Fill missing values
-        self.catalog_df['synonyms'] = self.catalog_df['synonyms'].fillna('')
-        self.catalog_df['category'] = self.catalog_df['category'].fillna('Unknown')
-        self.catalog_df['brand'] = self.catalog_df['brand'].fillna('Unknown')
+        df['synonyms'] = df['synonyms'].fillna('')
+        df['category'] = df['category'].fillna('Unknown')
+        df['brand'] = df['brand'].fillna('Unknown')
         
         # Clean item names - remove extra whitespace and normalize
-        self.catalog_df['item_name'] = self.catalog_df['item_name'].astype(str).str.strip()
+        df['item_name'] = df['item_name'].astype(str).str.strip()
         
         # Clean item codes - ensure they're strings and remove extra whitespace
-        self.catalog_df['item_code'] = self.catalog_df['item_code'].astype(str).str.strip()
+        df['item_code'] = df['item_code'].astype(str).str.strip()
         
         # Convert synonyms to list format - split by | and clean
-        self.catalog_df['synonyms'] = self.catalog_df['synonyms'].apply(
+        df['synonyms'] = df['synonyms'].apply(
             lambda x: [s.strip() for s in str(x).split('|') if s.strip()] if isinstance(x, str) and x.strip() else []
         )
         
         # Extract category from source file name if category is Unknown
-        self.catalog_df['category'] = self.catalog_df.apply(
+        df['category'] = df.apply(
             lambda row: row['source_file'].replace('.xlsx', '').title() 
             if row['category'] == 'Unknown' else row['category'], 
             axis=1
         )
         
         # Remove rows where item_code is empty or just whitespace
-        self.catalog_df = self.catalog_df[
-            (self.catalog_df['item_code'].notna()) & 
-            (self.catalog_df['item_code'].astype(str).str.strip().str.len() > 0)
+        df = df[
+            (df['item_code'].notna()) & 
+            (df['item_code'].astype(str).str.strip().str.len() > 0)
         ]
         
-        logger.info(f"Catalog cleaned: {len(self.catalog_df)} items remaining")
+        logger.info(f"Catalog cleaned: {len(df)} items remaining")
         
         # Log some sample data for verification
-        if len(self.catalog_df) > 0:
-            sample_items = self.catalog_df.head(3)
+        if len(df) > 0:
+            sample_items = df.head(3)
             logger.info("Sample cleaned items:")
             for _, item in sample_items.iterrows():
                 logger.info(f"  - {item['item_code']}: {item['item_name']} ({item['category']})")
-    
-    def _convert_to_catalog_items(self) -> None:
-        """Convert DataFrame to CatalogItem objects"""
-        self.catalog = []
-        conversion_errors = 0
-        
-        logger.info("Converting DataFrame rows to CatalogItem objects...")
-        
-        for idx, row in self.catalog_df.iterrows():
-            try:
-                # Validate required fields
-                if pd.isna(row['item_code']) or pd.isna(row['item_name']):
-                    logger.warning(f"Skipping row {idx}: missing required fields")
-                    continue
-                
-                # Clean and validate item_code
-                item_code = str(row['item_code']).strip()
-                if not item_code or item_code.lower() in ['nan', 'none', '']:
-                    logger.warning(f"Skipping row {idx}: invalid item_code: {item_code}")
-                    continue
-                
-                # Clean and validate item_name
-                item_name = str(row['item_name']).strip()
-                if not item_name or item_name.lower() in ['nan', 'none', '']:
-                    logger.warning(f"Skipping row {idx}: invalid item_name: {item_name}")
-                    continue
-                
-                # Get category from source file name (remove .xlsx extension)
-                category = str(row.get('source_file', 'Unknown')).replace('.xlsx', '').title()
-                
-                # Get source file name
-                source_file = str(row.get('source_file', 'Unknown'))
-                
-                # Get sheet name
-                sheet_name = str(row.get('sheet_name', 'Unknown'))
-                
-                # Create catalog item
-                catalog_item = CatalogItem(
-                    item_code=item_code,
-                    item_name=item_name,
-                    category=category,
-                    source_file=source_file,
-                    sheet_name=sheet_name
-                )
-                
-                self.catalog.append(catalog_item)
-                
-            except Exception as e:
-                conversion_errors += 1
-                logger.warning(f"Error converting row {idx} to CatalogItem: {e}")
-                logger.debug(f"Problematic row data: {row.to_dict()}")
-                continue
         
-        logger.info(f"Successfully converted {len(self.catalog)} rows to CatalogItem objects")
-        if conversion_errors > 0:
-            logger.warning(f"Failed to convert {conversion_errors} rows")
+        return df
+    
+    def _build_catalog_store(self, df: "pd.DataFrame") -> CatalogStore:
+        """Validate the cleaned DataFrame column by column and pack it into a CatalogStore"""
+        logger.info("Packing DataFrame rows into the columnar catalog store...")
+        
+        item_codes = df['item_code'].astype(str).str.strip()
+        item_names = df['item_name'].astype(str).str.strip()
+        source_files = df['source_file'].astype(str)
+        sheet_names = df['sheet_name'].astype(str)
+        # Category comes from the source file name (without the .xlsx extension)
+        categories = source_files.str.replace('.xlsx', '', regex=False).str.title()
+        
+        # Same rules the per-row CatalogItem validation applied: required code and name,
+        # no placeholder values, and the schema's field length limits
+        placeholders = ['nan', 'none', '']
+        valid = (
+            df['item_code'].notna() & df['item_name'].notna() &
+            ~item_codes.str.lower().isin(placeholders) & ~item_names.str.lower().isin(placeholders) &
+            (item_codes.str.len() <= 100) & (item_names.str.len() <= 200) &
+            (categories.str.len() <= 100) & (source_files.str.len() <= 100) & (sheet_names.str.len() <= 100)
+        )
+        skipped = int((~valid).sum())
+        if skipped:
+            logger.warning(f"Skipping {skipped} rows with missing, placeholder or over-long fields")
+        
+        store = CatalogStore.from_columns(
+            item_codes[valid].tolist(),
+            item_names[valid].tolist(),
+            categories[valid].tolist(),
+            source_files[valid].tolist(),
+            sheet_names[valid].tolist()
+        )
+        logger.info(f"Successfully packed {len(store)} catalog rows ({store.nbytes / 1024:.0f} KB)")
         
         # Log some sample items for verification
-        if self.catalog:
+        if len(store):
             logger.info("Sample catalog items:")
-            for i, item in enumerate(self.catalog[:3]):
-                logger.info(f"  {i+1}. {item.item_code}: {item.item_name} ({item.category}) - {item.source_file}")
+        for i, item in enumerate(store.items(range(min(3, len(store))))):
+            logger.info(f"  {i+1}. {item.item_code}: {item.item_name} ({item.category}) - {item.source_file}")
+        
+        return store
     
     def get_catalog_items(self) -> List[CatalogItem]:
-        """Get all catalog items"""
-        return self.catalog
+        """Get all catalog items as CatalogItem models (built on each call - prefer get_catalog_store)"""
+        return self.store.items()
     
-    def get_catalog_dataframe(self) -> Optional[pd.DataFrame]:
+    def get_catalog_store(self) -> CatalogStore:
+        """Get the columnar catalog"""
+        return self.store
+    
+    def get_catalog_dataframe(self) -> Optional["pd.DataFrame"]:
         """Get the catalog as a pandas DataFrame"""
         return self.catalog_df
     
     def search_items(self, query: str, limit: int = 10) -> List[CatalogItem]:
-        """Search items by name"""
+        """Search items by name: exact and prefix matches first, then other substring matches"""
         if not self.is_loaded_flag:
             return []
         
-        query_lower = query.lower()
-        results = []
-        
-        for item in self.catalog:
-            # Check item name
-            if query_lower in item.item_name.lower():
-                results.append(item)
-                if len(results) >= limit:
-                    break
-        
-        return results
+        return self.search_index.search(query, limit)
     
     def get_item_by_code(self, item_code: str) -> Optional[CatalogItem]:
-        """Get item by its code"""
-        for item in self.catalog:
-            if item.item_code == item_code:
-                return item
-        return None
+        """Get item by its code (the first one if several sheets list it)"""
+        items = self.search_index.get_by_code(item_code)
+        return items[0] if items else None
+    
+    def get_items_by_codes(self, item_codes: Iterable[str]) -> Dict[str, List[CatalogItem]]:
+        """Resolve many item codes in one call: code -> every matching item, [] if unknown"""
+        return self.search_index.get_by_codes(item_codes)
     
     def is_loaded(self) -> bool:
         """Check if catalog is loaded"""
@@ -355,22 +476,21 @@ class CatalogService:
         if not self.is_loaded_flag:
             return {"error": "Catalog not loaded"}
         
-        stats = {
-            "total_items": len(self.catalog),
-            "categories": {},
-            "source_files": {}
+        store = self.store
+        return {
+            "total_items": len(store),
+            "categories": self._value_counts(store.categories.counts()),
+            "source_files": self._value_counts(store.source_files.counts())
         }
-        
-        for item in self.catalog:
-            # Count categories
-            category = item.category or "Unknown"
-            stats["categories"][category] = stats["categories"].get(category, 0) + 1
-            
-            # Count source files
-            source_file = item.source_file or "Unknown"
-            stats["source_files"][source_file] = stats["source_files"].get(source_file, 0) + 1
-        
-        return stats
+    
+    @staticmethod
+    def _value_counts(counts: Dict[str, int]) -> Dict[str, int]:
+        """Fold empty values into 'Unknown'"""
+        folded: Dict[str, int] = {}
+        for value, count in counts.items():
+            value = value or "Unknown"
+            folded[value] = folded.get(value, 0) + count
+        return folded
     
     def _save_catalog_to_json(self) -> None:
         """Save catalog to JSON file for persistence"""
@@ -378,25 +498,18 @@ class CatalogService:
             # Ensure temp directory exists
             self.catalog_file.parent.mkdir(parents=True, exist_ok=True)
             
-            # Convert catalog items to dictionary format
-            catalog_data = []
-            for item in self.catalog:
-                catalog_data.append({
-                    'item_code': item.item_code,
-                    'item_name': item.item_name,
-                    'category': item.category,
-                    'source_file': item.source_file,
-                    'sheet_name': item.sheet_name
-                })
+            # Convert catalog rows to dictionary format
+            store = self.store
+            catalog_data = store.to_records()
             
             # Create comprehensive catalog summary
             catalog_summary = {
                 'metadata': {
-                    'total_items': len(self.catalog),
-                    'categories': list(set(item.category for item in self.catalog)),
-                    'source_files': list(set(item.source_file for item in self.catalog)),
-                    'sheets': list(set(f"{item.source_file}:{item.sheet_name}" for item in self.catalog)),
-                    'generated_at': pd.Timestamp.now().isoformat(),
+                    'total_items': len(store),
+                    'categories': list(store.categories.values),
+                    'source_files': list(store.source_files.values),
+                    'sheets': list(set(f"{item['source_file']}:{item['sheet_name']}" for item in catalog_data)),
+                    'generated_at': datetime.now().isoformat(),
                     'version': '1.0'
                 },
                 'items': catalog_data
@@ -409,35 +522,35 @@ class CatalogService:
             logger.info(f"✅ Catalog saved to {self.catalog_file}")
             
             # Also create a simple lookup file for quick access
-            self._create_lookup_files()
+            self._create_lookup_files(catalog_data)
             
         except Exception as e:
             logger.error(f"❌ Error saving catalog to JSON: {e}")
     
-    def _create_lookup_files(self) -> None:
+    def _create_lookup_files(self, catalog_data: List[Dict[str, str]]) -> None:
         """Create additional lookup files for easy access"""
         try:
             # Create item code to item name lookup
-            code_to_name = {item.item_code: item.item_name for item in self.catalog}
+            code_to_name = {item['item_code']: item['item_name'] for item in catalog_data}
             code_to_name_file = Path("temp/code_to_name.json")
             with open(code_to_name_file, 'w', encoding='utf-8') as f:
                 json.dump(code_to_name, f, indent=2, ensure_ascii=False)
             
             # Create item name to item code lookup
-            name_to_code = {item.item_name: item.item_code for item in self.catalog}
+            name_to_code = {item['item_name']: item['item_code'] for item in catalog_data}
             name_to_code_file = Path("temp/name_to_code.json")
             with open(name_to_code_file, 'w', encoding='utf-8') as f:
                 json.dump(name_to_code, f, indent=2, ensure_ascii=False)
             
             # Create category-based lookup
             category_lookup = {}
-            for item in self.catalog:
-                if item.category not in category_lookup:
-                    category_lookup[item.category] = []
-                category_lookup[item.category].append({
-                    'item_code': item.item_code,
-                    'item_name': item.item_name,
-                    'source_file': item.source_file
+            for item in catalog_data:
+                if item['category'] not in category_lookup:
+                    category_lookup[item['category']] = []
+                category_lookup[item['category']].append({
+                    'item_code': item['item_code'],
+                    'item_name': item['item_name'],
+                    'source_file': item['source_file']
                 })
             
             category_file = Path("temp/category_lookup.json")
@@ -449,6 +562,89 @@ class CatalogService:
         except Exception as e:
             logger.error(f"❌ Error creating lookup files: {e}")
     
+    def _publish_catalog(self, store: CatalogStore, search_index: CatalogSearchIndex,
+                         workbook_fingerprints: Optional[Dict[str, Dict[str, Any]]] = None) -> None:
+        """Swap in a fully built catalog; searches keep using the previous one until now"""
+        self.store = store
+        self.search_index = search_index
+        self.workbook_fingerprints = workbook_fingerprints or {}
+        self.is_loaded_flag = True
+        self.catalog_version += 1
+    
+    def save_catalog_snapshot(self, embeddings: Optional[np.ndarray] = None,
+                              embeddings_key: Optional[str] = None) -> None:
+        """Write the store, its lookup indexes and optionally catalog embeddings to one binary file
+        
+        Without embeddings the last saved ones are carried forward while they still have
+        one row per item, so rewriting the rows never drops them; readers check the key.
+        """
+        with self._snapshot_lock:
+            try:
+                store, search_index = self.store, self.search_index
+                if embeddings is None:
+                    embeddings, embeddings_key = self._snapshot_embeddings, self._snapshot_embeddings_key
+                    if embeddings is not None and embeddings.shape[0] != len(store):
+                        embeddings, embeddings_key = None, None
+                
+                arrays = store.to_arrays()
+                arrays.update(search_index.to_arrays())
+                metadata = {
+                    'version': CATALOG_SNAPSHOT_VERSION,
+                    'total_items': len(store),
+                    'generated_at': datetime.now().isoformat(),
+                    'workbooks': self.workbook_fingerprints
+                }
+                if embeddings is not None:
+                    arrays['embeddings'] = np.asarray(embeddings)
+                    metadata['embeddings_key'] = embeddings_key
+                
+                write_snapshot(self.snapshot_file, arrays, metadata)
+                self._snapshot_embeddings, self._snapshot_embeddings_key = embeddings, embeddings_key
+                logger.info(f"✅ Catalog snapshot saved to {self.snapshot_file}")
+            except Exception as e:
+                logger.error(f"❌ Error saving catalog snapshot: {e}")
+    
+    def load_catalog_snapshot(self) -> bool:
+        """Load catalog and lookup indexes from the binary snapshot if available
+        
+        Every column is a view into one read-only file mapping, so there is no parsing
+        and no per-row validation - the rows were validated when the snapshot was written.
+        """
+        try:
+            if not self.snapshot_file.exists():
+                logger.info("No existing catalog snapshot found")
+                return False
+            
+            arrays, metadata = read_snapshot(self.snapshot_file)
+            if metadata.get('version') != CATALOG_SNAPSHOT_VERSION:
+                logger.info(f"Ignoring catalog snapshot version {metadata.get('version')}")
+                return False
+            
+            store = CatalogStore.from_arrays(arrays)
+            self._publish_catalog(store, CatalogSearchIndex(store, arrays), metadata.get('workbooks'))
+            self._snapshot_embeddings = arrays.get('embeddings')
+            self._snapshot_embeddings_key = metadata.get('embeddings_key')
+            logger.info(f"✅ Catalog loaded from snapshot: {len(store)} items, "
+                        f"generated at {metadata.get('generated_at', 'unknown')}")
+            return True
+            
+        except Exception as e:
+            logger.error(f"❌ Error loading catalog snapshot: {e}")
+            return False
+    
+    def get_snapshot_embeddings(self, embeddings_key: str) -> Optional[np.ndarray]:
+        """Memory-map the embeddings saved in the snapshot, if they were saved under this key"""
+        try:
+            if not self.snapshot_file.exists():
+                return None
+            arrays, metadata = read_snapshot(self.snapshot_file)
+            if metadata.get('version') != CATALOG_SNAPSHOT_VERSION or metadata.get('embeddings_key') != embeddings_key:
+                return None
+            return arrays.get('embeddings')
+        except Exception as e:
+            logger.warning(f"Could not read embeddings from {self.snapshot_file}: {e}")
+            return None
+    
     def load_catalog_from_json(self) -> bool:
         """Load catalog from JSON file if available"""
         try:
@@ -461,20 +657,11 @@ class CatalogService:
             with open(self.catalog_file, 'r', encoding='utf-8') as f:
                 catalog_data = json.load(f)
             
-            # Convert back to CatalogItem objects
-            self.catalog = []
-            for item_data in catalog_data['items']:
-                catalog_item = CatalogItem(
-                    item_code=item_data['item_code'],
-                    item_name=item_data['item_name'],
-                    category=item_data.get('category', 'Unknown'),
-                    source_file=item_data.get('source_file', 'Unknown'),
-                    sheet_name=item_data.get('sheet_name', 'Unknown')
-                )
-                self.catalog.append(catalog_item)
-            
-            self.is_loaded_flag = True
-            logger.info(f"✅ Catalog loaded from JSON: {len(self.catalog)} items")
+            # Pack straight into columns - the file was written from validated rows
+            store = CatalogStore.from_records(catalog_data['items'])
+            
+            self._publish_catalog(store, CatalogSearchIndex(store))
+            logger.info(f"✅ Catalog loaded from JSON: {len(store)} items")
             
             # Log metadata
             metadata = catalog_data.get('metadata', {})
@@ -493,28 +680,11 @@ class CatalogService:
         if not self.is_loaded_flag:
             return {"error": "Catalog not loaded"}
         
-        summary = {
-            "total_items": len(self.catalog),
-            "categories": {},
-            "source_files": set(),
-            "item_codes": [],
-            "item_names": []
+        store = self.store
+        return {
+            "total_items": len(store),
+            "categories": self._value_counts(store.categories.counts()),
+            "source_files": [source_file for source_file in store.source_files.values if source_file],
+            "item_codes": store.item_codes.tolist(),
+            "item_names": store.item_names.tolist()
         }
-        
-        for item in self.catalog:
-            # Count categories
-            category = item.category or "Unknown"
-            summary["categories"][category] = summary["categories"].get(category, 0) + 1
-            
-            # Collect source files
-            if item.source_file:
-                summary["source_files"].add(item.source_file)
-            
-            # Collect item codes and names
-            summary["item_codes"].append(item.item_code)
-            summary["item_names"].append(item.item_name)
-        
-        # Convert sets to lists for JSON serialization
-        summary["source_files"] = list(summary["source_files"])
-        
-        return summary
@@ -0,0 +1,170 @@
+import os
+import json
+import logging
+from pathlib import Path
+from typing import Any, List, Optional, Union
+
+import numpy as np
+
+from config import config
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+ENCODER_BACKENDS = ("torch", "onnx", "onnx-int8")
+
+def export_onnx_model(model_name: str, model_dir: Path, quantize: bool = False) -> None:
+    """Export a sentence-transformers checkpoint to ONNX (and optionally int8) in model_dir
+    
+    Needs PyTorch and sentence-transformers, but only the first time - the exported
+    model, tokenizer and pooling settings are all written to model_dir.
+    """
+    model_dir.mkdir(parents=True, exist_ok=True)
+    fp32_path = model_dir / "model.onnx"
+    settings_path = model_dir / "encoder_config.json"
+    
+    if not (fp32_path.exists() and settings_path.exists()):
+        import torch
+        from sentence_transformers import SentenceTransformer
+        
+        logger.info(f"🔄 Exporting {model_name} to ONNX...")
+        st_model = SentenceTransformer(model_name, device="cpu")
+        transformer, pooling = st_model[0], st_model[1]
+        transformer.tokenizer.save_pretrained(str(model_dir))
+        
+        if getattr(pooling, "pooling_mode_cls_token", False):
+            pooling_mode = "cls"
+        elif getattr(pooling, "pooling_mode_max_tokens", False):
+            pooling_mode = "max"
+        else:
+            pooling_mode = "mean"
+        
+        sample = transformer.tokenizer(["warm up"], return_tensors="pt")
+        input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in sample]
+        dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names + ["last_hidden_state"]}
+        
+        tmp_path = fp32_path.with_suffix(f".{os.getpid()}.tmp")
+        with torch.no_grad():
+            torch.onnx.export(
+                transformer.auto_model.eval(),
+                tuple(sample[name] for name in input_names),
+                str(tmp_path),
+                input_names=input_names,
+                output_names=["last_hidden_state"],
+                dynamic_axes=dynamic_axes,
+                opset_version=14
+            )
+        os.replace(tmp_path, fp32_path)
+        
+        settings_path.write_text(json.dumps({
+            "model_name": model_name,
+            "pooling": pooling_mode,
+            "max_seq_length": st_model.max_seq_length
+        }, indent=2), encoding="utf-8")
+        logger.info(f"✅ Exported ONNX model to {fp32_path}")
+    
+    int8_path = model_dir / "model_int8.onnx"
+    if quantize and not int8_path.exists():
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        
+        # Dynamic quantization: int8 weights, activations quantized per batch at run time
+        tmp_path = int8_path.with_suffix(f".{os.getpid()}.tmp")
+        quantize_dynamic(str(fp32_path), str(tmp_path), weight_type=QuantType.QInt8)
+        os.replace(tmp_path, int8_path)
+        logger.info(f"✅ Quantized ONNX model to {int8_path}")
+
+class OnnxEncoder:
+    """Sentence encoder running an exported transformer through onnxruntime on CPU
+    
+    Drop-in for SentenceTransformer.encode. The export is cached under ONNX_CACHE_DIR,
+    so later starts load neither PyTorch nor the original checkpoint.
+    """
+    
+    def __init__(self, model_name: str, quantize: bool = False, cache_dir: Optional[Path] = None):
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+        
+        self.model_name = model_name
+        self.backend = "onnx-int8" if quantize else "onnx"
+        self.model_dir = Path(cache_dir or config.ONNX_CACHE_DIR) / model_name.replace("/", "__")
+        
+        model_path = self.model_dir / ("model_int8.onnx" if quantize else "model.onnx")
+        if not (model_path.exists() and (self.model_dir / "encoder_config.json").exists()):
+            export_onnx_model(model_name, self.model_dir, quantize)
+        
+        settings = json.loads((self.model_dir / "encoder_config.json").read_text(encoding="utf-8"))
+        self.pooling = settings["pooling"]
+        self.max_seq_length = settings["max_seq_length"]
+        self.tokenizer = AutoTokenizer.from_pretrained(str(self.model_dir))
+        
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(str(model_path), options, providers=["CPUExecutionProvider"])
+        self.input_names = [model_input.name for model_input in self.session.get_inputs()]
+    
+    def encode(self, sentences: Union[str, List[str]], batch_size: int = 32, **kwargs: Any) -> np.ndarray:
+        """Encode sentences into float32 embeddings, one row per sentence"""
+        single = isinstance(sentences, str)
+        if single:
+            sentences = [sentences]
+        if not sentences:
+            return np.empty((0, 0), dtype=np.float32)
+        
+        # Longest first, so each batch pads to a similar length (as sentence-transformers does)
+        order = np.argsort([-len(sentence) for sentence in sentences], kind="stable")
+        batches = []
+        for start in range(0, len(sentences), max(1, batch_size)):
+            batch = [sentences[position] for position in order[start:start + batch_size]]
+            batches.append(self._encode_batch(batch))
+        
+        embeddings = np.empty((len(sentences), batches[0].shape[1]), dtype=np.float32)
+        embeddings[order] = np.concatenate(batches)
+        return embeddings[0] if single else embeddings
+    
+    def _encode_batch(self, batch: List[str]) -> np.ndarray:
+        tokens = self.tokenizer(batch, padding=True, truncation=True, max_length=self.max_seq_length,
+                                return_tensors="np")
+        input_ids = tokens["input_ids"].astype(np.int64)
+        feeds = {
+            name: tokens[name].astype(np.int64) if name in tokens else np.zeros_like(input_ids)
+            for name in self.input_names
+        }
+        hidden = self.session.run(["last_hidden_state"], feeds)[0]
+        return self._pool(hidden, tokens["attention_mask"])
+    
+    def _pool(self, hidden: np.ndarray, attention_mask: np.ndarray) -> np.ndarray:
+        """Reduce token embeddings to one vector per sentence with the checkpoint's pooling"""
+        if self.pooling == "cls":
+            return hidden[:, 0].astype(np.float32)
+        
+        mask = attention_mask[:, :, np.newaxis].astype(np.float32)
+        if self.pooling == "max":
+            return np.where(mask > 0, hidden, -1e9).max(axis=1).astype(np.float32)
+        
+        summed = (hidden * mask).sum(axis=1)
+        return (summed / np.maximum(mask.sum(axis=1), 1e-9)).astype(np.float32)
+
+def encoder_backend(encoder: Any) -> str:
+    """Name of the backend an encoder actually runs on"""
+    return getattr(encoder, "backend", "torch")
+
+def create_encoder(model_name: Optional[str] = None, backend: Optional[str] = None) -> Any:
+    """Load the encoder configured by ENCODER_BACKEND ("torch", "onnx" or "onnx-int8")
+    
+    Falls back to the PyTorch SentenceTransformer if the ONNX backend cannot start.
+    """
+    model_name = model_name or config.MODEL_NAME
+    backend = (backend or config.ENCODER_BACKEND).lower()
+    
+    if backend in ("onnx", "onnx-int8"):
+        try:
+            encoder = OnnxEncoder(model_name, quantize=backend == "onnx-int8")
+            logger.info(f"✅ ONNX encoder loaded ({encoder.backend}): {model_name}")
+            return encoder
+        except Exception as e:
+            logger.error(f"❌ Could not start the {backend} encoder, falling back to PyTorch: {e}")
+    elif backend not in ENCODER_BACKENDS:
+        logger.warning(f"Unknown encoder backend '{backend}', using torch")
+    
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(model_name)
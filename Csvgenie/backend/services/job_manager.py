@@ -0,0 +1,180 @@
+import time
+import uuid
+import threading
+import logging
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from models.schemas import JobInfo, JobStatus, ProcessedOrder
+from services.order_processor import OrderProcessor
+from services.processing_pool import ProcessingPool
+from utils.exceptions import JobNotFinishedError, JobNotFoundError
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def _isoformat(timestamp: Optional[float]) -> Optional[str]:
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat()
+
+class Job:
+    """One queued order file and its progress, updated by the worker thread"""
+    
+    def __init__(self, filename: str, content: bytes):
+        self.job_id = uuid.uuid4().hex
+        self.filename = filename
+        self.content: Optional[bytes] = content
+        self.status = JobStatus.QUEUED
+        self.total_lines = 0
+        self.mapped_count = 0
+        self.unmapped_count = 0
+        self.result: Optional[ProcessedOrder] = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+    
+    def update_progress(self, mapped_count: int, unmapped_count: int) -> None:
+        self.mapped_count = mapped_count
+        self.unmapped_count = unmapped_count
+    
+    def to_info(self, result_ttl: float) -> JobInfo:
+        expires_at = None
+        if self.finished_at is not None and result_ttl > 0:
+            expires_at = self.finished_at + result_ttl
+        
+        return JobInfo(
+            job_id=self.job_id,
+            status=self.status,
+            filename=self.filename,
+            total_lines=self.total_lines,
+            processed_lines=self.mapped_count + self.unmapped_count,
+            mapped_count=self.mapped_count,
+            unmapped_count=self.unmapped_count,
+            created_at=_isoformat(self.created_at),
+            started_at=_isoformat(self.started_at),
+            finished_at=_isoformat(self.finished_at),
+            expires_at=_isoformat(expires_at),
+            error=self.error
+        )
+
+class JobManager:
+    """Runs uploaded orders as background jobs so large files do not hold a request open
+    
+    Jobs run on their own bounded pool, separate from the interactive upload pool.
+    Finished jobs, and the CSV files they generated, are discarded after `result_ttl` seconds.
+    """
+    
+    def __init__(self, order_processor: OrderProcessor, max_workers: int, max_queue: int, result_ttl: float):
+        self.order_processor = order_processor
+        self.result_ttl = result_ttl
+        self.pool = ProcessingPool(max_workers, max_queue)
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+    
+    def submit(self, filename: str, content: bytes) -> JobInfo:
+        """Queue an order file, raising ProcessingQueueFullError when the job queue is full"""
+        self.purge_expired()
+        job = Job(filename, content)
+        
+        with self._lock:
+            self._jobs[job.job_id] = job
+        
+        try:
+            self.pool.submit(self._run, job)
+        except Exception:
+            with self._lock:
+                self._jobs.pop(job.job_id, None)
+            raise
+        
+        logger.info(f"📥 Queued job {job.job_id} for '{filename}'")
+        return job.to_info(self.result_ttl)
+    
+    def get_job(self, job_id: str) -> JobInfo:
+        """Get status and progress of a job"""
+        return self._get(job_id).to_info(self.result_ttl)
+    
+    def get_result(self, job_id: str) -> ProcessedOrder:
+        """Get the result of a completed job"""
+        job = self._get(job_id)
+        
+        if job.status == JobStatus.FAILED:
+            raise JobNotFinishedError(f"Job {job_id} failed: {job.error}", details={"status": job.status.value})
+        if job.status != JobStatus.COMPLETED:
+            raise JobNotFinishedError(f"Job {job_id} is still {job.status.value}", details={"status": job.status.value})
+        
+        return job.result
+    
+    def _get(self, job_id: str) -> Job:
+        self.purge_expired()
+        with self._lock:
+            job = self._jobs.get(job_id)
+        
+        if job is None:
+            raise JobNotFoundError(f"Job {job_id} not found or expired")
+        return job
+    
+    def _run(self, job: Job) -> None:
+        job.started_at = time.time()
+        job.status = JobStatus.RUNNING
+        
+        try:
+            text_content = job.content.decode('utf-8')
+            job.content = None  # The decoded text is all that is needed from here on
+            
+            job.total_lines = self.order_processor.count_order_lines(text_content)
+            job.result = self.order_processor.process_order_text(text_content, job.update_progress)
+            logger.info(f"✅ Job {job.job_id} completed: {job.result.mapped_count} mapped, "
+                        f"{job.result.unmapped_count} unmapped")
+            
+        except Exception as e:
+            job.error = str(e)
+            logger.error(f"❌ Job {job.job_id} failed: {e}")
+        finally:
+            job.content = None
+            job.finished_at = time.time()
+            # Status flips last so pollers never see a finished job without its result
+            job.status = JobStatus.COMPLETED if job.result is not None else JobStatus.FAILED
+    
+    def purge_expired(self) -> int:
+        """Drop finished jobs older than the TTL and delete their CSV files"""
+        if self.result_ttl <= 0:
+            return 0
+        
+        cutoff = time.time() - self.result_ttl
+        with self._lock:
+            expired: List[Job] = [
+                job for job in self._jobs.values()
+                if job.finished_at is not None and job.finished_at < cutoff
+            ]
+            for job in expired:
+                del self._jobs[job.job_id]
+        
+        for job in expired:
+            if job.result is not None and job.result.csv_filename:
+                csv_path = Path("temp") / job.result.csv_filename
+                try:
+                    csv_path.unlink()
+                except OSError:
+                    pass
+        
+        if expired:
+            logger.info(f"🧹 Expired {len(expired)} finished jobs")
+        return len(expired)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get job counts by status and pool utilisation"""
+        with self._lock:
+            statuses = [job.status.value for job in self._jobs.values()]
+        
+        return {
+            "jobs": {status.value: statuses.count(status.value) for status in JobStatus},
+            "result_ttl_seconds": self.result_ttl,
+            "pool": self.pool.get_stats()
+        }
+    
+    def shutdown(self) -> None:
+        """Wait for running jobs and stop the pool"""
+        self.pool.shutdown()
@@ -1,50 +1,137 @@
 import re
 import time
-import pandas as pd
+import hashlib
+import uuid
 import numpy as np
 from pathlib import Path
-from typing import List, Dict, Any, Tuple, Optional
+from typing import List, Dict, Any, Tuple, Optional, Set, NamedTuple, Iterable, Iterator, Union, Callable
 import logging
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
 import tempfile
 import os
+import threading
+from contextlib import contextmanager
 
-from models.schemas import MappedItem, ProcessedOrder, MatchConfidence, CatalogItem
+try:
+    import fcntl  # POSIX only; without it each worker may encode the catalog itself
+except ImportError:
+    fcntl = None
+
+from models.schemas import (
+    MappedItem, UnmappedItem, ProcessedOrder, OrderSummary, BatchFileResult, BatchProcessedOrder,
+    MatchConfidence
+)
+from models.catalog_store import CatalogStore
 from services.catalog_service import CatalogService
+from services.vector_index import VectorIndex, create_vector_index
+from services.encoders import create_encoder, encoder_backend
+from utils.cache import LRUCache
+from utils.similarity import normalize_embeddings
+from utils.quantity_parser import parse_quantity_line
+from utils.text_normalizer import normalize_order_text, normalize_order_texts
 from config import config
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+class LineMatch(NamedTuple):
+    """Outcome of parsing and matching a single order line"""
+    item_text: str
+    quantity: float
+    mapped_item: Optional[MappedItem]
+    unmapped_reason: Optional[str]
+
 class OrderProcessor:
     """Service for processing order text and mapping items to catalog"""
     
     def __init__(self, catalog_service: CatalogService):
         self.catalog_service = catalog_service
         self.model = None
+        self.encoder_id = config.MODEL_NAME  # Model plus encoder backend; keys every embedding cache
         self.catalog_embeddings = None
         self.catalog_texts = []
+        self.catalog_store = CatalogStore.empty()
+        self.vector_index: Optional[VectorIndex] = None
+        self.catalog_name_index: Dict[str, int] = {}
+        self.catalog_code_index: Dict[str, int] = {}
+        self.indexed_catalog_version = None
+        self.query_embedding_cache = LRUCache(config.QUERY_CACHE_SIZE, config.QUERY_CACHE_TTL_SECONDS)
+        self.line_result_cache = LRUCache(config.LINE_CACHE_SIZE, config.LINE_CACHE_TTL_SECONDS)
+        self._embeddings_lock = threading.Lock()
+        self._model_lock = threading.Lock()
         self.confidence_thresholds = {
             'high': config.CONFIDENCE_THRESHOLD_HIGH,
             'medium': config.CONFIDENCE_THRESHOLD_MEDIUM,
             'low': config.CONFIDENCE_THRESHOLD_LOW
         }
         
-        # Initialize the ML model
-        self._initialize_model()
+        # The model is loaded on first use (or by warm_up) so importing and constructing the
+        # processor stays cheap and the server can bind its port straight away
+    
+    def load_model(self):
+        """Load the encoder once, even when called from several threads, and return it"""
+        if self.model is not None:
+            return self.model
+        
+        with self._model_lock:
+            if self.model is None:
+                self._initialize_model()
+                
+                if config.QUERY_CACHE_PERSIST:
+                    self.load_query_cache()
+        
+        return self.model
     
     def _initialize_model(self):
-        """Initialize the Hugging Face sentence transformer model"""
+        """Initialize the sentence encoder on the configured backend (PyTorch or ONNX Runtime)"""
         try:
             logger.info("Loading sentence transformer model...")
             from config import config
-            self.model = SentenceTransformer(config.MODEL_NAME)
-            logger.info(f"✅ Sentence transformer model loaded successfully: {config.MODEL_NAME}")
+            model = create_encoder(config.MODEL_NAME, config.ENCODER_BACKEND)
+            
+            # Backends produce slightly different vectors, so they must not share cached embeddings
+            backend = encoder_backend(model)
+            self.encoder_id = config.MODEL_NAME if backend == "torch" else f"{config.MODEL_NAME}#{backend}"
+            self.model = model
+            logger.info(f"✅ Sentence transformer model loaded successfully: {config.MODEL_NAME} ({backend})")
         except Exception as e:
             logger.error(f"❌ Error loading model: {e}")
             raise
     
+    def warm_up(self) -> None:
+        """Build catalog embeddings and run a dummy encode so the first request is fast"""
+        start_time = time.time()
+        logger.info("🔥 Warming up order processor...")
+        
+        self.load_model()
+        self._ensure_catalog_embeddings()
+        
+        # Run one encode to allocate the model's buffers before real traffic arrives
+        self.model.encode(["warm up"], batch_size=1)
+        
+        logger.info(f"✅ Order processor warmed up in {(time.time() - start_time) * 1000:.0f}ms")
+    
+    def is_ready(self) -> bool:
+        """Check if the model is loaded and embeddings match the current catalog version
+        
+        Derived from live state, so it turns true after a lazy build on first request and
+        false again while embeddings are rebuilt after a catalog reload.
+        """
+        return self.model is not None and self._catalog_embeddings_current()
+    
+    def _ensure_catalog_embeddings(self) -> None:
+        """Prepare catalog embeddings once per catalog version, even when called from several threads"""
+        if self._catalog_embeddings_current():
+            return
+        
+        with self._embeddings_lock:
+            if not self._catalog_embeddings_current():
+                self._prepare_catalog_embeddings()
+    
+    def _catalog_embeddings_current(self) -> bool:
+        """Check if embeddings and index were built for the currently loaded catalog"""
+        return (self.vector_index is not None and
+                self.indexed_catalog_version == self.catalog_service.catalog_version)
+    
     def _prepare_catalog_embeddings(self):
         """Prepare embeddings for all catalog items"""
         if not self.catalog_service.is_loaded():
@@ -52,22 +139,214 @@ class OrderProcessor:
         
         logger.info("Preparing catalog embeddings...")
         
-        # Get catalog items
-        catalog_items = self.catalog_service.get_catalog_items()
-        
-        # Prepare text representations for each catalog item
-        self.catalog_texts = []
-        for item in catalog_items:
-            # Enhanced text representation with better preprocessing
-            text = self._preprocess_catalog_text(item)
-            self.catalog_texts.append(text)
-        
-        # Generate embeddings for all catalog texts
-        if self.model:
-            self.catalog_embeddings = self.model.encode(self.catalog_texts)
-            logger.info(f"✅ Generated embeddings for {len(self.catalog_texts)} catalog items")
+        # The embeddings cache key depends on the encoder backend, so load it first
+        self.load_model()
+        
+        # Get the columnar catalog
+        catalog_version = self.catalog_service.catalog_version
+        catalog_store = self.catalog_service.get_catalog_store()
+        
+        # Rows the previous catalog version already encoded can be copied instead of re-encoded
+        previous_texts, previous_embeddings = self.catalog_texts, self.catalog_embeddings
+        
+        # Prepare text representations for each catalog row (plain tuples, no models). Kept
+        # local until the swap below: if encoding fails, the texts must still match the
+        # embeddings the next attempt reuses rows from
+        catalog_texts = [self._preprocess_catalog_text(row) for row in catalog_store.rows()]
+        
+        # Reuse embeddings from a previous run when catalog and model are unchanged
+        cache_key = self._catalog_embeddings_cache_key(catalog_texts)
+        with self._embeddings_file_lock():
+            catalog_embeddings = None
+            if config.ENABLE_EMBEDDINGS_CACHE:
+                catalog_embeddings = self._load_cached_embeddings(cache_key, len(catalog_texts))
+                if catalog_embeddings is not None:
+                    logger.info(f"✅ Loaded cached embeddings for {len(catalog_texts)} catalog items")
+            
+            # Generate embeddings for all catalog texts
+            if catalog_embeddings is None:
+                if not self.model:
+                    raise ValueError("ML model not initialized")
+                
+                if previous_embeddings is None and self.vector_index is not None:
+                    # No float32 rows kept (quantized or IVF index, or no embeddings cache):
+                    # dequantize the previous index so unchanged items are still not re-encoded
+                    previous_embeddings = self.vector_index.reconstruct()
+                
+                catalog_embeddings = self._encode_catalog_texts(catalog_texts, previous_texts, previous_embeddings)
+                
+                if config.ENABLE_EMBEDDINGS_CACHE:
+                    self._save_cached_embeddings(cache_key, catalog_embeddings)
+                    if config.SHARED_EMBEDDINGS:
+                        # Drop the private copy in favour of the shared mapping
+                        shared_embeddings = self._load_cached_embeddings(cache_key, len(catalog_texts))
+                        if shared_embeddings is not None:
+                            catalog_embeddings = shared_embeddings
+        
+        # Build the search indexes; swap everything in together so readers see one consistent version
+        vector_index = create_vector_index(catalog_embeddings)
+        if not isinstance(catalog_embeddings, np.memmap) and not np.may_share_memory(vector_index.matrix.data, catalog_embeddings):
+            # The index keeps its own quantized or reordered copy; hold on to the float32 rows
+            # (for incremental re-encoding) only as a read-only disk mapping, never privately
+            catalog_embeddings = (self._load_cached_embeddings(cache_key, len(catalog_texts), mmap=True)
+                                  if config.ENABLE_EMBEDDINGS_CACHE else None)
+        name_index, code_index = self._build_exact_match_indexes(catalog_store)
+        self.catalog_store = catalog_store
+        self.catalog_texts = catalog_texts
+        self.catalog_name_index = name_index
+        self.catalog_code_index = code_index
+        self.catalog_embeddings = catalog_embeddings
+        self.vector_index = vector_index
+        self.indexed_catalog_version = catalog_version
+        
+        # Results for the previous catalog version can never be hit again
+        self.line_result_cache.clear()
+    
+    def _encode_catalog_texts(self, texts: List[str], previous_texts: List[str],
+                              previous_embeddings: Optional[np.ndarray]) -> np.ndarray:
+        """Encode catalog texts as normalized float32 rows, so every query is a single dot product
+        
+        After an incremental catalog reload most texts are unchanged; their rows are copied
+        from the previous embeddings and only added or edited items go through the model.
+        """
+        batch_size = max(1, config.BATCH_SIZE)
+        reusable: Dict[str, int] = {}
+        if previous_embeddings is not None and len(previous_texts) == len(previous_embeddings):
+            reusable = {text: row for row, text in enumerate(previous_texts)}
+        
+        if not reusable:
+            embeddings = normalize_embeddings(self.model.encode(texts, batch_size=batch_size), copy=False)
+            logger.info(f"✅ Generated embeddings for {len(texts)} catalog items")
+            return embeddings
+        
+        new_texts = list(dict.fromkeys(text for text in texts if text not in reusable))
+        embeddings = np.empty((len(texts), previous_embeddings.shape[1]), dtype=np.float32)
+        reused_rows = [row for row, text in enumerate(texts) if text in reusable]
+        embeddings[reused_rows] = previous_embeddings[[reusable[texts[row]] for row in reused_rows]]
+        if new_texts:
+            encoded = normalize_embeddings(self.model.encode(new_texts, batch_size=batch_size), copy=False)
+            new_positions = {text: position for position, text in enumerate(new_texts)}
+            new_rows = [row for row, text in enumerate(texts) if text not in reusable]
+            embeddings[new_rows] = encoded[[new_positions[texts[row]] for row in new_rows]]
+        
+        logger.info(f"✅ Reused embeddings for {len(reused_rows)} unchanged catalog items, "
+                    f"generated {len(texts) - len(reused_rows)} for added or changed items")
+        return embeddings
+    
+    def _catalog_embeddings_cache_key(self, catalog_texts: List[str]) -> str:
+        """Hash the model name and catalog texts into an embeddings cache key"""
+        digest = hashlib.sha256()
+        digest.update(b'normalized-float32\0')
+        digest.update(self.encoder_id.encode('utf-8'))
+        for text in catalog_texts:
+            digest.update(b'\0')
+            digest.update(text.encode('utf-8'))
+        return digest.hexdigest()[:32]
+    
+    def _embeddings_cache_path(self, cache_key: str) -> Path:
+        """Get the on-disk location of the catalog embeddings for a cache key"""
+        return config.TEMP_DIR / f"catalog_embeddings_{cache_key}.npy"
+    
+    @contextmanager
+    def _embeddings_file_lock(self) -> Iterator[None]:
+        """Let one process encode the catalog while other workers wait to map its result"""
+        if not (config.SHARED_EMBEDDINGS and config.ENABLE_EMBEDDINGS_CACHE and fcntl is not None):
+            yield
+            return
+        
+        config.TEMP_DIR.mkdir(parents=True, exist_ok=True)
+        with open(config.TEMP_DIR / "catalog_embeddings.lock", 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+    
+    def _load_cached_embeddings(self, cache_key: str, row_count: int,
+                                mmap: Optional[bool] = None) -> Optional[np.ndarray]:
+        """Load catalog embeddings for row_count items from disk if a cache file exists for this key
+        
+        With SHARED_EMBEDDINGS (or mmap=True) the file is memory-mapped read-only, so every
+        worker process shares one copy of the matrix through the page cache. With
+        SNAPSHOT_EMBEDDINGS the matrix comes from the catalog snapshot instead, which
+        is always memory-mapped.
+        """
+        if config.SNAPSHOT_EMBEDDINGS:
+            embeddings = self.catalog_service.get_snapshot_embeddings(cache_key)
         else:
-            raise ValueError("ML model not initialized")
+            cache_path = self._embeddings_cache_path(cache_key)
+            if not cache_path.exists():
+                logger.info("No cached catalog embeddings found")
+                return None
+            
+            try:
+                if mmap is None:
+                    mmap = config.SHARED_EMBEDDINGS
+                embeddings = np.load(cache_path, mmap_mode='r' if mmap else None, allow_pickle=False)
+            except Exception as e:
+                logger.warning(f"Could not read cached embeddings from {cache_path}: {e}")
+                return None
+        
+        if embeddings is None:
+            logger.info("No cached catalog embeddings found")
+            return None
+        if embeddings.ndim != 2 or embeddings.shape[0] != row_count or embeddings.dtype != np.float32:
+            logger.warning(f"Ignoring cached embeddings with unexpected shape {embeddings.shape}")
+            return None
+        return embeddings
+    
+    def _save_cached_embeddings(self, cache_key: str, embeddings: np.ndarray) -> None:
+        """Write catalog embeddings to disk and remove stale cache files"""
+        if config.SNAPSHOT_EMBEDDINGS:
+            self.catalog_service.save_catalog_snapshot(embeddings, cache_key)
+            return
+        
+        cache_path = self._embeddings_cache_path(cache_key)
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            
+            # Write to a temporary file first so readers never see a partial matrix
+            tmp_path = cache_path.with_suffix(f'.{os.getpid()}.tmp')
+            with open(tmp_path, 'wb') as f:
+                np.save(f, np.asarray(embeddings), allow_pickle=False)
+            os.replace(tmp_path, cache_path)
+            
+            # Processes still mapping a stale file keep their pages until they reload
+            for stale_path in cache_path.parent.glob("catalog_embeddings_*.npy"):
+                if stale_path != cache_path:
+                    stale_path.unlink()
+            
+            logger.info(f"✅ Catalog embeddings cached to {cache_path}")
+        except Exception as e:
+            logger.error(f"❌ Error caching catalog embeddings: {e}")
+    
+    def _build_exact_match_indexes(self, catalog_store: CatalogStore) -> Tuple[Dict[str, int], Dict[str, int]]:
+        """Build normalized item name -> position and item code -> position lookups"""
+        name_index: Dict[str, int] = {}
+        code_index: Dict[str, int] = {}
+        
+        # First occurrence wins when the same name or code appears in several sheets
+        item_codes = catalog_store.item_codes.tolist()
+        for position, item_name in enumerate(catalog_store.item_names.tolist()):
+            name_key = self._clean_text(item_name)
+            if name_key:
+                name_index.setdefault(name_key, position)
+            code_index.setdefault(item_codes[position].strip(), position)
+        
+        logger.info(f"✅ Built exact-match indexes: {len(name_index)} names, {len(code_index)} codes")
+        return name_index, code_index
+    
+    def _clean_text(self, text: str) -> str:
+        """Lowercase, replace special characters with spaces and collapse whitespace"""
+        
+        # Clean and normalize text
+        text = text.lower()
+        
+        # Remove special characters but keep spaces
+        text = re.sub(r'[^\w\s]', ' ', text)
+        
+        # Normalize whitespace
+        return re.sub(r'\s+', ' ', text).strip()
     
     def _preprocess_catalog_text(self, item) -> str:
         """Preprocess catalog item text for better matching"""
@@ -81,13 +360,7 @@ class OrderProcessor:
         ]
         
         # Clean and normalize text
-        text = ' '.join(text_parts).lower()
-        
-        # Remove special characters but keep spaces
-        text = re.sub(r'[^\w\s]', ' ', text)
-        
-        # Normalize whitespace
-        text = re.sub(r'\s+', ' ', text).strip()
+        text = self._clean_text(' '.join(text_parts))
         
         # Add common variations and synonyms
         variations = []
@@ -118,290 +391,465 @@ class OrderProcessor:
     
     def _preprocess_order_text(self, text: str) -> str:
         """Preprocess order text for better matching"""
-        import re
-        
-        # Convert to lowercase
-        text = text.lower()
-        
-        # Remove common headers and non-item text
-        headers_to_remove = [
-            'grocery list', 'shopping list', 'order', 'items', 'need to buy',
-            'please make sure', 'everything is fresh', 'organic when possible'
-        ]
-        
-        for header in headers_to_remove:
-            text = text.replace(header, '')
-        
-        # Normalize common food terms
-        text = re.sub(r'\bapples?\b', 'apple', text)
-        text = re.sub(r'\bbananas?\b', 'banana', text)
-        text = re.sub(r'\boranges?\b', 'orange', text)
-        text = re.sub(r'\btomatoes?\b', 'tomato', text)
-        text = re.sub(r'\bonions?\b', 'onion', text)
-        text = re.sub(r'\bpotatoes?\b', 'potato', text)
-        
-        # Normalize common measurements
-        text = re.sub(r'\b(lbs?|pounds?)\b', 'lb', text)
-        text = re.sub(r'\b(oz|ounces?)\b', 'oz', text)
-        text = re.sub(r'\b(grams?|g)\b', 'g', text)
-        text = re.sub(r'\b(ml|milliliters?)\b', 'ml', text)
-        
-        # Clean up whitespace
-        text = re.sub(r'\s+', ' ', text).strip()
-        
-        return text
+        return normalize_order_text(text)
     
-    def process_order_text(self, text_content: str) -> ProcessedOrder:
+    def process_order_text(self, text_content: str,
+                           progress_callback: Optional[Callable[[int, int], None]] = None) -> ProcessedOrder:
         """Process order text and return mapped results"""
+        return self.process_order_lines(text_content.split('\n'), progress_callback)
+    
+    def process_order_lines(self, lines: Iterable[str],
+                            progress_callback: Optional[Callable[[int, int], None]] = None) -> ProcessedOrder:
+        """Process an iterable of raw order lines (e.g. streamed from an upload) and return mapped results
+        
+        `progress_callback(mapped_count, unmapped_count)` is called after each matched line.
+        """
+        mapped_items = []
+        unmapped_items = []
+        summary = None
+        
+        for result in self.iter_order_results(lines):
+            if isinstance(result, MappedItem):
+                mapped_items.append(result)
+            elif isinstance(result, UnmappedItem):
+                unmapped_items.append(result)
+            else:
+                summary = result
+                continue
+            
+            if progress_callback is not None:
+                progress_callback(len(mapped_items), len(unmapped_items))
+        
+        return ProcessedOrder(
+            mapped_items=mapped_items,
+            unmapped_items=unmapped_items,
+            **summary.model_dump()
+        )
+    
+    def iter_order_results(self, lines: Iterable[str]) -> Iterator[Union[MappedItem, UnmappedItem, OrderSummary]]:
+        """Yield each MappedItem or UnmappedItem as soon as its batch is matched, then an OrderSummary"""
         start_time = time.time()
         
         try:
-            # Ensure catalog embeddings are ready
-            if self.catalog_embeddings is None:
-                self._prepare_catalog_embeddings()
-            
-            # Parse the order text
-            parsed_items = self._parse_order_text(text_content)
-            logger.info(f"Parsed {len(parsed_items)} items from order text")
-            
-            # Map items to catalog
             mapped_items = []
-            unmapped_items = []
-            
-            for item_text, quantity in parsed_items:
-                if quantity == 0:
-                    # This is a weight specification or complex format that couldn't be parsed
-                    unmapped_items.append({
-                        'original_text': item_text,
-                        'quantity': 0,
-                        'original_line': item_text,
-                        'reason': 'Weight specification or complex format'
-                    })
-                    continue
-                
-                mapped_item = self._map_item_to_catalog(item_text, quantity)
-                
-                if mapped_item and mapped_item.confidence != MatchConfidence.UNMATCHED:
-                    mapped_items.append(mapped_item)
-                else:
-                    # Store unmapped items with both original text and quantity
-                    unmapped_items.append({
-                        'original_text': item_text,
-                        'quantity': quantity,
-                        'original_line': f"{quantity} {item_text}" if quantity > 0 else item_text,
-                        'reason': 'No catalog match found'
-                    })
+            unmapped_count = 0
+            total_items = 0
+            
+            for line_matches in self.iter_line_matches(lines):
+                total_items += len(line_matches)
+                for line_match in line_matches:
+                    if line_match.mapped_item is not None:
+                        mapped_items.append(line_match.mapped_item)
+                        yield line_match.mapped_item
+                    else:
+                        # Store unmapped items with both original text and quantity
+                        unmapped_count += 1
+                        yield UnmappedItem(**self._unmapped_item_record(line_match))
+            
+            logger.info(f"Parsed {total_items} items from order text")
             
             # Generate CSV file
             csv_filename = self._generate_csv(mapped_items)
             
             processing_time = (time.time() - start_time) * 1000  # Convert to milliseconds
             
-            result = ProcessedOrder(
-                mapped_items=mapped_items,
-                unmapped_items=unmapped_items,
-                total_items=len(parsed_items),
+            logger.info(f"✅ Order processed successfully: {len(mapped_items)} mapped, {unmapped_count} unmapped")
+            yield OrderSummary(
+                total_items=total_items,
                 mapped_count=len(mapped_items),
-                unmapped_count=len(unmapped_items),
+                unmapped_count=unmapped_count,
                 csv_filename=csv_filename,
                 processing_time_ms=processing_time
             )
             
-            logger.info(f"✅ Order processed successfully: {len(mapped_items)} mapped, {len(unmapped_items)} unmapped")
-            return result
-            
         except Exception as e:
             logger.error(f"❌ Error processing order: {e}")
             raise
     
-    def _parse_order_text(self, text_content: str) -> List[Tuple[str, float]]:
-        """Parse order text to extract items and quantities"""
-        # Split text into lines and clean
-        lines = [line.strip() for line in text_content.split('\n') if line.strip()]
-        
-        parsed_items = []
+    def process_order_batch(self, orders: Iterable[Tuple[str, Iterable[str]]]) -> BatchProcessedOrder:
+        """Process several order files in one pass and return per-file results plus a combined CSV
+        
+        Lines from all files share encoder batches, so many small orders cost a few full
+        batches instead of one partial batch each. `orders` yields (filename, lines) pairs.
+        Each file's processing_time_ms is its share of every batch it had lines in (split
+        by line count) plus its own CSV, so the per-file times add up to the batch total.
+        """
+        start_time = time.time()
         
-        for line in lines:
-            # Skip empty lines and common headers
-            if not line or line.lower() in ['grocery list', 'shopping list', 'order', 'items']:
-                continue
+        try:
+            filenames: List[str] = []
+            mapped_by_file: List[List[MappedItem]] = []
+            unmapped_by_file: List[List[UnmappedItem]] = []
+            time_by_file: List[float] = []
+            
+            def tagged_lines() -> Iterator[Tuple[int, str]]:
+                for filename, lines in orders:
+                    filenames.append(filename)
+                    mapped_by_file.append([])
+                    unmapped_by_file.append([])
+                    time_by_file.append(0.0)
+                    file_index = len(filenames) - 1
+                    for line in lines:
+                        yield file_index, line
+            
+            batch_start = time.time()
+            for tagged_matches in self._iter_tagged_line_matches(tagged_lines()):
+                # Time since the previous batch covers reading, parsing, encoding and matching this one
+                batch_time = (time.time() - batch_start) * 1000
+                for file_index, line_match in tagged_matches:
+                    time_by_file[file_index] += batch_time / len(tagged_matches)
+                    if line_match.mapped_item is not None:
+                        mapped_by_file[file_index].append(line_match.mapped_item)
+                    else:
+                        unmapped_by_file[file_index].append(UnmappedItem(**self._unmapped_item_record(line_match)))
+                batch_start = time.time()
+            
+            orders_processed = []
+            for file_index, filename in enumerate(filenames):
+                csv_start = time.time()
+                mapped_items, unmapped_items = mapped_by_file[file_index], unmapped_by_file[file_index]
+                csv_filename = self._generate_csv(mapped_items)
+                orders_processed.append(BatchFileResult(
+                    filename=filename,
+                    result=ProcessedOrder(
+                        mapped_items=mapped_items,
+                        unmapped_items=unmapped_items,
+                        total_items=len(mapped_items) + len(unmapped_items),
+                        mapped_count=len(mapped_items),
+                        unmapped_count=len(unmapped_items),
+                        csv_filename=csv_filename,
+                        processing_time_ms=time_by_file[file_index] + (time.time() - csv_start) * 1000
+                    )
+                ))
+            
+            # Combined CSV tags each row with the order file it came from
+            all_mapped = [item for mapped_items in mapped_by_file for item in mapped_items]
+            all_sources = [filename for filename, mapped_items in zip(filenames, mapped_by_file) for _ in mapped_items]
+            combined_csv = self._generate_csv(all_mapped, source_files=all_sources, prefix="processed_batch")
+            
+            mapped_count = len(all_mapped)
+            unmapped_count = sum(len(unmapped_items) for unmapped_items in unmapped_by_file)
+            logger.info(f"✅ Batch of {len(filenames)} orders processed: {mapped_count} mapped, {unmapped_count} unmapped")
+            
+            return BatchProcessedOrder(
+                orders=orders_processed,
+                total_files=len(filenames),
+                total_items=mapped_count + unmapped_count,
+                mapped_count=mapped_count,
+                unmapped_count=unmapped_count,
+                combined_csv_filename=combined_csv,
+                processing_time_ms=(time.time() - start_time) * 1000
+            )
             
-            # Extract quantity and item description
-            quantity, item_text = self._extract_quantity_and_item(line)
+        except Exception as e:
+            logger.error(f"❌ Error processing order batch: {e}")
+            raise
+    
+    def iter_line_matches(self, lines: Iterable[str]) -> Iterator[List[LineMatch]]:
+        """Parse, encode and match lines lazily, yielding results one batch at a time
+        
+        Lines are pulled from the iterable as needed, so memory stays flat however
+        large the order is.
+        """
+        for tagged_matches in self._iter_tagged_line_matches((None, line) for line in lines):
+            yield [line_match for _, line_match in tagged_matches]
+    
+    def _iter_tagged_line_matches(self, tagged_lines: Iterable[Tuple[Any, str]]) -> Iterator[List[Tuple[Any, LineMatch]]]:
+        """Like iter_line_matches, but for (tag, line) pairs; each result keeps its line's tag
+        
+        Lines that are skipped or parse to nothing have no result, so batches can be
+        shorter than BATCH_SIZE.
+        """
+        # Ensure catalog embeddings are ready
+        self._ensure_catalog_embeddings()
+        
+        batch_size = max(1, config.BATCH_SIZE)
+        tags: List[Any] = []
+        batch: List[str] = []
+        
+        for tag, line in tagged_lines:
+            line = self._clean_order_line(line)
+            if line is None:
+                continue
+            tags.append(tag)
+            batch.append(line)
+            if len(batch) >= batch_size:
+                yield self._tag_line_matches(tags, self._process_order_lines(batch))
+                tags, batch = [], []
+        
+        if batch:
+            yield self._tag_line_matches(tags, self._process_order_lines(batch))
+    
+    @staticmethod
+    def _tag_line_matches(tags: List[Any], line_matches: List[Optional[LineMatch]]) -> List[Tuple[Any, LineMatch]]:
+        return [(tag, line_match) for tag, line_match in zip(tags, line_matches) if line_match is not None]
+    
+    def _unmapped_item_record(self, line_match: LineMatch) -> Dict[str, Any]:
+        """Build the unmapped item entry for a line that couldn't be matched"""
+        quantity = line_match.quantity
+        return {
+            'original_text': line_match.item_text,
+            'quantity': quantity,
+            'original_line': f"{quantity} {line_match.item_text}" if quantity > 0 else line_match.item_text,
+            'reason': line_match.unmapped_reason
+        }
+    
+    def _process_order_lines(self, lines: List[str]) -> List[Optional[LineMatch]]:
+        """Parse and match order lines, reusing cached results for lines seen before
+        
+        Returns one entry per line, None where the line held no item.
+        """
+        fingerprint = self._line_cache_fingerprint()
+        results: List[Optional[LineMatch]] = [self.line_result_cache.get((fingerprint, line)) for line in lines]
+        
+        # Parse only the lines that weren't cached
+        parsed_lines = {}
+        for position, line in enumerate(lines):
+            if results[position] is None:
+                parsed_lines[position] = self._parse_order_line(line)
+        
+        # Encode and match every item with a quantity in one batched pass
+        matchable_positions = [position for position, parsed in parsed_lines.items()
+                               if parsed is not None and parsed[1] != 0]
+        mapped_items, failed = self._match_items([parsed_lines[position] for position in matchable_positions])
+        mapped_by_position = dict(zip(matchable_positions, mapped_items))
+        failed_positions = {matchable_positions[i] for i in failed}
+        
+        for position, parsed in parsed_lines.items():
+            if parsed is None:
+                continue
             
-            if item_text:
-                if quantity > 0:
-                    # Valid item with quantity
-                    parsed_items.append((item_text, quantity))
+            item_text, quantity = parsed
+            if quantity == 0:
+                # This is a weight specification or complex format that couldn't be parsed
+                line_match = LineMatch(item_text, 0, None, 'Weight specification or complex format')
+            else:
+                mapped_item = mapped_by_position[position]
+                if mapped_item and mapped_item.confidence != MatchConfidence.UNMATCHED:
+                    line_match = LineMatch(item_text, quantity, mapped_item, None)
                 else:
-                    # Weight specification or complex format - add to unmapped items
-                    logger.debug(f"Adding weight specification to unmapped: '{line}'")
-                    parsed_items.append((line, 0))  # 0 quantity marks it as unmapped
+                    line_match = LineMatch(item_text, quantity, None, 'No catalog match found')
+            
+            results[position] = line_match
+            
+            # Don't remember lines that only failed because of a transient encoding error
+            if position not in failed_positions:
+                self.line_result_cache.put((fingerprint, lines[position]), line_match)
+        
+        return results
+    
+    def _line_cache_fingerprint(self) -> Tuple[Any, ...]:
+        """Identify the catalog version and matching settings that line results depend on"""
+        return (
+            self.indexed_catalog_version,
+            self.encoder_id,
+            config.CONFIDENCE_THRESHOLD_HIGH,
+            config.CONFIDENCE_THRESHOLD_MEDIUM,
+            config.CONFIDENCE_THRESHOLD_LOW,
+            config.MIN_SIMILARITY_THRESHOLD,
+            config.MAX_CANDIDATES_PER_ITEM,
+            config.VECTOR_INDEX,
+            config.IVF_NPROBE,
+            config.EMBEDDING_PRECISION
+        )
+    
+    def count_order_lines(self, text_content: str) -> int:
+        """Count the lines process_order_text will parse as items"""
+        return sum(1 for _ in self._iter_order_lines(text_content.split('\n')))
+    
+    def _split_order_lines(self, text_content: str) -> List[str]:
+        """Split order text into stripped lines, skipping empty lines and common headers"""
+        return list(self._iter_order_lines(text_content.split('\n')))
+    
+    def _iter_order_lines(self, lines: Iterable[str]) -> Iterator[str]:
+        """Strip raw lines, skipping empty lines and common headers"""
+        for line in lines:
+            line = self._clean_order_line(line)
+            if line is not None:
+                yield line
+    
+    def _clean_order_line(self, line: str) -> Optional[str]:
+        """Strip a raw line; None for empty lines and common headers"""
+        line = line.strip()
+        if line and line.lower() not in ['grocery list', 'shopping list', 'order', 'items']:
+            return line
+        return None
+    
+    def _parse_order_line(self, line: str) -> Optional[Tuple[str, float]]:
+        """Parse one order line into (item_text, quantity); quantity 0 marks it as unmapped"""
+        # Extract quantity and item description
+        quantity, item_text = self._extract_quantity_and_item(line)
+        
+        if not item_text:
+            return None
+        
+        if quantity > 0:
+            # Valid item with quantity
+            return item_text, quantity
         
-        return parsed_items
+        # Weight specification or complex format - add to unmapped items
+        logger.debug(f"Adding weight specification to unmapped: '{line}'")
+        return line, 0  # 0 quantity marks it as unmapped
+    
+    def _parse_order_text(self, text_content: str) -> List[Tuple[str, float]]:
+        """Parse order text to extract items and quantities"""
+        parsed_items = [self._parse_order_line(line) for line in self._split_order_lines(text_content)]
+        return [parsed for parsed in parsed_items if parsed is not None]
     
     def _extract_quantity_and_item(self, text: str) -> Tuple[float, str]:
         """Extract quantity and item description from text with smart parsing"""
-        # Clean the text first
-        text = text.strip()
+        return parse_quantity_line(text)
+    
+    def _map_item_to_catalog(self, item_text: str, quantity: float) -> Optional[MappedItem]:
+        """Map an item to the catalog using semantic similarity"""
+        return self._map_items_to_catalog([(item_text, quantity)])[0]
+    
+    def _map_items_to_catalog(self, items: List[Tuple[str, float]]) -> List[Optional[MappedItem]]:
+        """Map a list of (item_text, quantity) pairs to the catalog in batches"""
+        return self._match_items(items)[0]
+    
+    def _match_items(self, items: List[Tuple[str, float]]) -> Tuple[List[Optional[MappedItem]], Set[int]]:
+        """Match items in batches, returning the results and the positions that failed with an error"""
+        failed: Set[int] = set()
+        if not items:
+            return [], failed
+        
+        # Take local references so a concurrent catalog reload can't mix versions mid-order
+        vector_index = self.vector_index
+        catalog_store = self.catalog_store
+        name_index = self.catalog_name_index
+        code_index = self.catalog_code_index
+        
+        if vector_index is None:
+            logger.warning("Catalog embeddings not available, using fallback matching")
+            return [self._fallback_matching(item_text, quantity) for item_text, quantity in items], set(range(len(items)))
         
-        # Smart quantity patterns for complex grocery orders
-        quantity_patterns = [
-            # Pattern: "Item - Final Quantity" (e.g., "Urad Dhal 4*10lb- 1 case")
-            r'^(.+?)\s+(\d+)\s*\*\s*\d+(?:\.\d+)?\s*(?:lbs?|kg|g|oz|ml|l|qt|gal)\s*-\s*(\d+(?:\.\d+)?)\s*(case|box|packet|pkt|pcs?|pieces?|units?|bags?|bottles?|cans?|packets?|boxes?)',
-            
-            # Pattern: "Item Weight * Final Quantity" (e.g., "Cardamom green 5lb *3pkts" or "Cinnamon 5lb *3")
-            r'^(.+?)\s+(\d+(?:\.\d+)?)\s*(lbs?|kg|g|oz|ml|l|qt|gal)\s*\*\s*(\d+(?:\.\d+)?)(?:\s*(pkts?|packets?|pcs?|pieces?|units?|bags?|bottles?|cans?|boxes?|case))?$',
-            
-            # Pattern: "Item - Quantity units" (e.g., "Item - 1 case")
-            r'^(.+?)\s*-\s*(\d+(?:\.\d+)?)\s*(case|box|packet|pkt|pcs?|pieces?|units?|bags?|bottles?|cans?|packets?|boxes?)',
-            
-            # Pattern: "Item Quantity units" (e.g., "Item 1 case")
-            r'^(.+?)\s+(\d+(?:\.\d+)?)\s*(case|box|packet|pkt|pcs?|pieces?|units?|bags?|bottles?|cans?|packets?|boxes?)',
-            
-            # Pattern: "Quantity units Item" (e.g., "1 case Item")
-            r'^(\d+(?:\.\d+)?)\s*(case|box|packet|pkt|pcs?|pieces?|units?|bags?|bottles?|cans?|packets?|boxes?)\s+(.+)',
-            
-            # Pattern: "Item Weight" (e.g., "150lbs" - should not be treated as quantity)
-            # Only match if there's no * or other quantity indicators
-            r'^(.+?)\s+(\d+(?:\.\d+)?)\s*(lbs?|kg|g|oz|ml|l|qt|gal)$',
-            
-            # Pattern: "Weight Item" (e.g., "150lbs Item")
-            r'^(\d+(?:\.\d+)?)\s*(lbs?|kg|g|oz|ml|l|qt|gal)\s+(.+)',
-            
-            # Pattern: "Item Quantity" (fallback for simple cases)
-            r'^(.+?)\s+(\d+(?:\.\d+)?)',
-            
-            # Pattern: "Quantity Item" (fallback for simple cases)
-            r'^(\d+(?:\.\d+)?)\s+(.+)',
+        # Exact item code or normalized name hits never touch the model
+        results: List[Optional[MappedItem]] = [
+            self._match_exact(item_text, quantity, catalog_store, name_index, code_index)
+            for item_text, quantity in items
         ]
+        pending = [i for i, result in enumerate(results) if result is None]
+        if len(pending) < len(items):
+            logger.info(f"Exact-matched {len(items) - len(pending)} of {len(items)} items")
+        
+        # Preprocess every remaining line up front so the encoder sees whole batches
+        processed_texts = normalize_order_texts([items[i][0] for i in pending])
+        batch_size = max(1, config.BATCH_SIZE)
         
-        for pattern in quantity_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                try:
-                    groups = match.groups()
-                    
-                    if len(groups) == 4:  # Complex pattern like "Item 4*10lb- 1 case"
-                        item_text = groups[0].strip()
-                        # Skip the weight multiplier (groups[1] and groups[2])
-                        quantity = float(groups[3])
-                        unit_type = groups[4].lower()
-                        
-                        # Clean up item text
-                        item_text = re.sub(r'^\s*[-–—]\s*', '', item_text)
-                        item_text = item_text.strip()
-                        
-                        if quantity > 0 and item_text and len(item_text) > 1:
-                            logger.debug(f"Complex parsed: '{item_text}' (Qty: {quantity} {unit_type}) from '{text}'")
-                            return quantity, item_text
-                            
-                    elif len(groups) >= 3:  # Pattern like "Item Weight * Quantity" (with optional unit type)
-                        item_text = groups[0].strip()
-                        weight = groups[1]
-                        weight_unit = groups[2].lower()
-                        quantity = float(groups[3])
-                        
-                        # Unit type is optional (e.g., "Cinnamon 5lb *3" has no explicit unit)
-                        unit_type = groups[4].lower() if len(groups) > 4 and groups[4] else "units"
-                        
-                        # Clean up item text
-                        item_text = re.sub(r'^\s*[-–—]\s*', '', item_text)
-                        item_text = item_text.strip()
-                        
-                        if quantity > 0 and item_text and len(item_text) > 1:
-                            logger.debug(f"Weight-based parsed: '{item_text}' (Qty: {quantity} {unit_type}) from '{text}'")
-                            return quantity, item_text
-                            
-                    elif len(groups) == 2:  # Simple patterns
-                        first_group = groups[0].strip()
-                        second_group = groups[1].strip()
-                        
-                        # Check if this is a weight-only pattern (should not be treated as quantity)
-                        if re.search(r'\b(lbs?|kg|g|oz|ml|l|qt|gal)\b', second_group, re.IGNORECASE):
-                            # This is a weight specification, not a quantity
-                            logger.debug(f"Weight specification detected: '{text}' - treating as unmapped")
-                            return 0, text  # Return 0 quantity to mark as unmapped
-                        
-                        # Try to parse first group as quantity
-                        try:
-                            quantity = float(first_group)
-                            item_text = second_group
-                        except ValueError:
-                            # First group is not a number, try second group
-                            try:
-                                quantity = float(second_group)
-                                item_text = first_group
-                            except ValueError:
-                                # Neither is a number, skip this pattern
-                                continue
-                        
-                        # Clean up item text
-                        item_text = re.sub(r'^\s*[-–—]\s*', '', item_text)
-                        item_text = item_text.strip()
-                        
-                        if quantity > 0 and item_text and len(item_text) > 1:
-                            logger.debug(f"Simple parsed: '{item_text}' (Qty: {quantity}) from '{text}'")
-                            return quantity, item_text
-                        
-                except (ValueError, IndexError) as e:
-                    logger.debug(f"Pattern failed for '{text}': {e}")
-                    continue
-        
-        # If no pattern matches, try to extract any number and use the rest as item
-        logger.warning(f"No pattern matched for text: '{text}'")
-        
-        # Look for any number in the text
-        number_match = re.search(r'(\d+(?:\.\d+)?)', text)
-        if number_match:
+        for start in range(0, len(pending), batch_size):
+            batch_positions = pending[start:start + batch_size]
+            batch_texts = processed_texts[start:start + batch_size]
+            
             try:
-                potential_quantity = float(number_match.group(1))
-                # Remove the number and clean up
-                item_text = re.sub(r'\d+(?:\.\d+)?', '', text).strip()
-                item_text = re.sub(r'^\s*[-–—]\s*', '', item_text)
-                
-                # Check if this looks like a weight specification
-                if re.search(r'\b(lbs?|kg|g|oz|ml|l|qt|gal)\b', text, re.IGNORECASE):
-                    logger.debug(f"Weight specification detected in fallback: '{text}' - treating as unmapped")
-                    return 0, text  # Return 0 quantity to mark as unmapped
-                
-                if item_text and len(item_text) > 1:
-                    logger.debug(f"Fallback parsed: '{item_text}' (Qty: {potential_quantity}) from '{text}'")
-                    return potential_quantity, item_text
-            except ValueError:
-                pass
+                # One forward pass and one index search per batch
+                batch_embeddings = self._encode_queries(batch_texts)
+                batch_scores, batch_indices = vector_index.search(batch_embeddings, config.MAX_CANDIDATES_PER_ITEM)
+            except Exception as e:
+                logger.error(f"Error encoding batch of {len(batch_positions)} items: {e}")
+                failed.update(batch_positions)
+                continue
+            
+            for position, top_similarities, top_indices in zip(batch_positions, batch_scores, batch_indices):
+                item_text, quantity = items[position]
+                results[position] = self._select_best_match(item_text, quantity, top_similarities, top_indices, catalog_store)
         
-        # If we can't parse anything, return 0 quantity to mark as unmapped
-        logger.debug(f"Could not parse quantity from: '{text}' - marking as unmapped")
-        return 0, text
+        return results, failed
+    
+    def _encode_queries(self, texts: List[str]) -> np.ndarray:
+        """Encode preprocessed order texts into normalized embeddings, reusing cached ones"""
+        embeddings: List[Optional[np.ndarray]] = [
+            self.query_embedding_cache.get((self.encoder_id, text)) for text in texts
+        ]
         
-        # Last resort: assume quantity 1 and use the whole text
-        logger.warning(f"Using fallback for text: '{text}'")
-        return 1.0, text.strip()
+        # Encode each distinct missing text once
+        missing_texts = list(dict.fromkeys(text for text, embedding in zip(texts, embeddings) if embedding is None))
+        if missing_texts:
+            encoded = normalize_embeddings(self.model.encode(missing_texts, batch_size=max(1, config.BATCH_SIZE)), copy=False)
+            encoded_by_text = dict(zip(missing_texts, encoded))
+            for text, embedding in encoded_by_text.items():
+                # Cache a copy: a row view would keep the whole batch matrix alive
+                self.query_embedding_cache.put((self.encoder_id, text), embedding.copy())
+            embeddings = [encoded_by_text[text] if embedding is None else embedding
+                          for text, embedding in zip(texts, embeddings)]
+        
+        return np.vstack(embeddings)
     
-    def _map_item_to_catalog(self, item_text: str, quantity: float) -> Optional[MappedItem]:
-        """Map an item to the catalog using semantic similarity"""
-        if self.catalog_embeddings is None:
-            logger.warning("Catalog embeddings not available, using fallback matching")
-            return self._fallback_matching(item_text, quantity)
+    def _query_cache_path(self) -> Path:
+        """Get the on-disk location of the persisted query embedding cache"""
+        return config.TEMP_DIR / "query_embeddings.npz"
+    
+    def load_query_cache(self) -> None:
+        """Load persisted query embeddings for the current model"""
+        cache_path = self._query_cache_path()
+        if not cache_path.exists():
+            return
         
         try:
-            # Preprocess the input text
-            processed_text = self._preprocess_order_text(item_text)
-            
-            # Generate embedding for the processed text
-            item_embedding = self.model.encode([processed_text])
+            with np.load(cache_path, allow_pickle=False) as data:
+                if str(data['model_name']) != self.encoder_id:
+                    logger.info("Persisted query cache was built with another model, ignoring it")
+                    return
+                
+                for text, embedding, stored_at in zip(data['texts'], data['embeddings'], data['stored_at']):
+                    self.query_embedding_cache.put((self.encoder_id, str(text)), embedding.copy(), float(stored_at))
             
-            # Calculate cosine similarity with all catalog items
-            similarities = cosine_similarity(item_embedding, self.catalog_embeddings)[0]
+            logger.info(f"✅ Loaded {len(self.query_embedding_cache)} cached query embeddings")
+        except Exception as e:
+            logger.warning(f"Could not load query cache from {cache_path}: {e}")
+    
+    def save_query_cache(self) -> None:
+        """Persist the query embedding cache so it survives restarts"""
+        entries = [(key[1], embedding, stored_at)
+                   for key, embedding, stored_at in self.query_embedding_cache.items()
+                   if key[0] == self.encoder_id]
+        if not entries:
+            return
+        
+        cache_path = self._query_cache_path()
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            texts, embeddings, stored_at = zip(*entries)
             
-            # Get top candidates
-            top_indices = np.argsort(similarities)[::-1][:config.MAX_CANDIDATES_PER_ITEM]
-            top_similarities = similarities[top_indices]
+            # Per-process temp name: every uvicorn worker saves its cache at shutdown
+            tmp_path = cache_path.with_suffix(f'.{os.getpid()}.tmp')
+            with open(tmp_path, 'wb') as f:
+                np.savez(f, model_name=np.array(self.encoder_id), texts=np.array(texts),
+                         embeddings=np.vstack(embeddings), stored_at=np.array(stored_at))
+            os.replace(tmp_path, cache_path)
             
+            logger.info(f"✅ Saved {len(entries)} query embeddings to {cache_path}")
+        except Exception as e:
+            logger.error(f"❌ Error saving query cache: {e}")
+    
+    def _match_exact(self, item_text: str, quantity: float, catalog_store: CatalogStore,
+                     name_index: Dict[str, int], code_index: Dict[str, int]) -> Optional[MappedItem]:
+        """Match an item whose text is exactly a catalog item code or normalized item name"""
+        position = code_index.get(item_text.strip())
+        if position is None:
+            position = name_index.get(self._clean_text(item_text))
+        if position is None:
+            return None
+        
+        catalog_item = catalog_store.item(position)
+        logger.info(f"Exact-matched '{item_text}' to '{catalog_item.item_name}'")
+        
+        return MappedItem(
+            original_text=item_text,
+            item_code=catalog_item.item_code,
+            item_name=catalog_item.item_name,
+            category=catalog_item.category,
+            quantity=quantity,
+            confidence=MatchConfidence.HIGH,
+            similarity_score=1.0
+        )
+    
+    def _select_best_match(self, item_text: str, quantity: float, top_similarities: np.ndarray,
+                           top_indices: np.ndarray, catalog_store: CatalogStore) -> Optional[MappedItem]:
+        """Pick the best catalog candidate for one item from its top-k search results"""
+        try:
             # Get the corresponding catalog items
-            catalog_items = self.catalog_service.get_catalog_items()
-            top_candidates = [catalog_items[i] for i in top_indices]
+            top_candidates = catalog_store.items(top_indices)
             
             # Find the best match above minimum threshold
             best_match_idx = None
@@ -503,8 +951,9 @@ class OrderProcessor:
         else:
             return MatchConfidence.UNMATCHED
     
-    def _generate_csv(self, mapped_items: List[MappedItem]) -> Optional[str]:
-        """Generate CSV file from mapped items"""
+    def _generate_csv(self, mapped_items: List[MappedItem], source_files: Optional[List[str]] = None,
+                      prefix: str = "processed_order") -> Optional[str]:
+        """Generate CSV file from mapped items, optionally tagging each row with its source file"""
         try:
             if not mapped_items:
                 return None
@@ -515,8 +964,9 @@ class OrderProcessor:
             
             # Prepare data for CSV
             csv_data = []
-            for item in mapped_items:
-                csv_data.append({
+            for position, item in enumerate(mapped_items):
+                row = {'Source File': source_files[position]} if source_files is not None else {}
+                row.update({
                     'Item Code': item.item_code or '',
                     'Item Name': item.item_name or '',
                     'Category': item.category or '',
@@ -525,10 +975,13 @@ class OrderProcessor:
                     'Similarity Score': f"{item.similarity_score:.3f}" if item.similarity_score else '',
                     'Original Text': item.original_text
                 })
+                csv_data.append(row)
             
             # Create DataFrame and save to CSV
+            import pandas as pd
             df = pd.DataFrame(csv_data)
-            filename = f"processed_order_{int(time.time())}.csv"
+            # The random suffix keeps orders finished in the same second from overwriting each other
+            filename = f"{prefix}_{int(time.time())}_{uuid.uuid4().hex[:8]}.csv"
             filepath = temp_dir / filename
             
             df.to_csv(filepath, index=False)
@@ -544,7 +997,12 @@ class OrderProcessor:
         """Get processing statistics"""
         return {
             "model_loaded": self.model is not None,
-            "catalog_embeddings_ready": self.catalog_embeddings is not None,
+            "catalog_embeddings_ready": self.vector_index is not None,
+            "catalog_embeddings_shared": isinstance(self.catalog_embeddings, np.memmap),
+            "vector_index": self.vector_index.get_stats() if self.vector_index else None,
+            "ready": self.is_ready(),
+            "query_cache": self.query_embedding_cache.get_stats(),
+            "line_cache": self.line_result_cache.get_stats(),
             "catalog_items_count": len(self.catalog_texts) if self.catalog_texts else 0,
             "confidence_thresholds": self.confidence_thresholds
         }
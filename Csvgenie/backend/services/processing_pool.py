@@ -0,0 +1,101 @@
+import asyncio
+import threading
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, Optional
+
+from utils.exceptions import ProcessingQueueFullError
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class ProcessingPool:
+    """Bounded thread pool for running CPU-bound order processing off the event loop"""
+    
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="order-processing")
+        
+        # One slot per running task plus one per queued task
+        self._slots = threading.BoundedSemaphore(self.max_workers + self.max_queue)
+        self._in_flight = 0
+        self._lock = threading.Lock()
+    
+    def submit(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        """Submit a task, raising ProcessingQueueFullError when no slot is free"""
+        self._reserve_slot()
+        
+        try:
+            future = self._executor.submit(func, *args, **kwargs)
+        except Exception:
+            self._release_slot()
+            raise
+        
+        # Release the slot when the work actually finishes, even if the caller stopped waiting
+        future.add_done_callback(lambda _: self._release_slot())
+        return future
+    
+    async def run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run a task in the pool and await its result from the event loop"""
+        future = self.submit(func, *args, **kwargs)
+        return await asyncio.wrap_future(future)
+    
+    def stream(self, iterator: Iterator[Any]) -> AsyncIterator[Any]:
+        """Drain a blocking iterator in the pool, one item per step, as an async iterator
+        
+        The slot is reserved immediately, so ProcessingQueueFullError is raised before a
+        streaming response starts. It is held until the iterator is exhausted or abandoned.
+        """
+        self._reserve_slot()
+        return self._iterate(iterator)
+    
+    async def _iterate(self, iterator: Iterator[Any]) -> AsyncIterator[Any]:
+        done = object()
+        future: Optional[Future] = None
+        
+        try:
+            while True:
+                future = self._executor.submit(next, iterator, done)
+                item = await asyncio.wrap_future(future)
+                if item is done:
+                    break
+                yield item
+        finally:
+            # A client that disconnects mid-step leaves that step running; free the slot when it ends
+            if future is not None and not future.done():
+                future.add_done_callback(lambda _: self._release_slot())
+            else:
+                self._release_slot()
+    
+    def _reserve_slot(self) -> None:
+        if not self._slots.acquire(blocking=False):
+            raise ProcessingQueueFullError(
+                "Order processing queue is full, please retry shortly",
+                details=self.get_stats()
+            )
+        
+        with self._lock:
+            self._in_flight += 1
+    
+    def _release_slot(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+        self._slots.release()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get current pool utilisation"""
+        with self._lock:
+            in_flight = self._in_flight
+        
+        return {
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "in_flight": in_flight,
+            "queued": max(0, in_flight - self.max_workers)
+        }
+    
+    def shutdown(self) -> None:
+        """Stop accepting work and wait for running tasks"""
+        logger.info("Shutting down order processing pool...")
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Test the LRU/TTL cache in utils/cache.py used for query embeddings and line results
+Run this script after changing utils/cache.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Add the backend directory to Python path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from utils.cache import LRUCache
+
+def test_lru_eviction():
+    """The least recently used entry goes first, and a get counts as a use"""
+    cache = LRUCache(max_size=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "b" is now the least recently used
+    
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert len(cache) == 2
+    
+    cache.put("a", 10)  # Overwriting refreshes the entry too
+    cache.put("d", 4)
+    assert cache.get("c") is None and cache.get("a") == 10
+    
+    stats = cache.get_stats()
+    assert (stats["hits"], stats["misses"]) == (4, 2), stats
+    assert abs(stats["hit_rate"] - 4 / 6) < 1e-9
+    
+    disabled = LRUCache(max_size=0)
+    disabled.put("a", 1)
+    assert disabled.get("a", "missing") == "missing" and len(disabled) == 0
+    
+    cache.clear()
+    assert len(cache) == 0 and cache.get("a") is None
+    print("   ✅ LRU eviction")
+
+def test_ttl_expiry():
+    """Entries older than ttl_seconds miss and are dropped; ttl_seconds=0 never expires"""
+    cache = LRUCache(max_size=10, ttl_seconds=60)
+    cache.put("fresh", 1)
+    cache.put("stale", 2, stored_at=time.time() - 61)
+    
+    assert cache.get("fresh") == 1
+    assert [key for key, _, _ in cache.items()] == ["fresh"]
+    assert cache.get("stale") is None
+    assert len(cache) == 1, "an expired entry was kept after a miss"
+    
+    forever = LRUCache(max_size=10, ttl_seconds=0)
+    forever.put("old", 1, stored_at=0.0)
+    assert forever.get("old") == 1
+    
+    # items() keeps stored_at, so a persisted cache can be restored with its original age
+    restored = LRUCache(max_size=10, ttl_seconds=60)
+    for key, value, stored_at in cache.items():
+        restored.put(key, value, stored_at)
+    assert next(restored.items())[2] == next(cache.items())[2]
+    print("   ✅ TTL expiry")
+
+if __name__ == "__main__":
+    print("🧪 Testing LRU Cache...")
+    try:
+        test_lru_eviction()
+        test_ttl_expiry()
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        sys.exit(1)
+    print("\n🎉 All cache tests passed!")
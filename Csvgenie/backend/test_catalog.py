@@ -69,6 +69,20 @@ async def test_catalog_service():
         for result in search_results:
             print(f"      - {result.item_code}: {result.item_name}")
         
+        sample_codes = [item.item_code for item in catalog_items[:3]] + ["NO-SUCH-CODE"]
+        items_by_code = catalog_service.get_items_by_codes(sample_codes)
+        if all(items_by_code[code] for code in sample_codes[:3]) and not items_by_code["NO-SUCH-CODE"]:
+            print(f"   ✅ Bulk code lookup resolved {len(sample_codes) - 1} codes and skipped the unknown one")
+        else:
+            print(f"   ❌ Bulk code lookup returned {items_by_code}")
+        
+        changes = catalog_service.reload_catalog()
+        repeat = catalog_service.reload_catalog()
+        if not (repeat["added"] or repeat["changed"] or repeat["removed"]) and repeat["total_items"] == changes["total_items"]:
+            print(f"   ✅ Repeat reload skipped all {repeat['unchanged']} unchanged workbooks")
+        else:
+            print(f"   ❌ Repeat reload reported changes: {repeat}")
+        
         # Test 8: Test catalog DataFrame
         print("\n8️⃣ Testing Catalog DataFrame...")
         df = catalog_service.get_catalog_dataframe()
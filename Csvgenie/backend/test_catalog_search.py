@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Test the indexed catalog search in services/catalog_search.py against the linear
+substring scan /catalog/search used before
+Run this script after changing services/catalog_search.py
+"""
+
+import re
+import sys
+import random
+from pathlib import Path
+
+# Add the backend directory to Python path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from models.catalog_store import CatalogRow, CatalogStore
+from services.catalog_search import CatalogSearchIndex
+
+QUERIES = ["r", "ri", "ce", "rice", "dal", "al ", "10lb", "l 1", "é", "ée", "जी", "जीरा", "basmati rice 10lb", "zz", "10"]
+
+def random_catalog(size: int, seed: int = 0):
+    """Names built from a small vocabulary so queries hit every tier, with repeats and accents"""
+    rng = random.Random(seed)
+    words = ["rice", "basmati", "dal", "toor", "Ricebran", "oil", "10lb", "1l", "purée", "जीरा", "masala", "a"]
+    names = [" ".join(rng.choice(words) for _ in range(rng.randint(1, 4))) for _ in range(size)]
+    names += ["Rice", "rice", "Dal", "basmati rice 10lb"]
+    return [CatalogRow(f"C{position}", name, "", "f.xlsx", "s") for position, name in enumerate(names)]
+
+def linear_search(names, query: str, limit: int):
+    """The original search_items loop: catalog order, stop at limit"""
+    return [position for position, name in enumerate(names) if query in name][:limit]
+
+def ranked_search(names, query: str, limit: int):
+    """The documented ranking written out directly: prefix, word prefix, then any substring"""
+    prefix = sorted((name, position) for position, name in enumerate(names) if name.startswith(query))
+    found = [position for _, position in prefix]
+    
+    tokens = sorted({token for name in names for token in re.findall(r'\w+', name) if token.startswith(query)})
+    for token in tokens:
+        found += [position for position, name in enumerate(names)
+                  if token in re.findall(r'\w+', name) and position not in found]
+    
+    found += [position for position, name in enumerate(names) if query in name and position not in found]
+    return found[:limit]
+
+def test_tier_order():
+    """Results match the reference ranking exactly, and contain the query like the linear scan"""
+    rows = random_catalog(2000)
+    index = CatalogSearchIndex(CatalogStore.from_rows(rows))
+    names = [row.item_name.lower() for row in rows]
+    codes = [row.item_code for row in rows]
+    
+    for query in QUERIES:
+        for limit in (1, 10, len(rows)):
+            found = [item.item_code for item in index.search(query, limit)]
+            expected = [codes[position] for position in ranked_search(names, query, limit)]
+            assert found == expected, f"{query!r} limit {limit}: {found[:5]} != {expected[:5]}"
+        
+        # With no limit the index finds exactly what the old scan found, just ranked
+        everything = {item.item_code for item in index.search(query, len(rows))}
+        assert everything == {codes[position] for position in linear_search(names, query, len(rows))}, query
+    
+    assert index.search("RICE", 1)[0].item_name.lower() == "rice", "the exact name should rank first, case-insensitively"
+    assert index.search("", 10) == [] and index.search("rice", 0) == []
+    print(f"   ✅ tier order for {len(QUERIES)} queries")
+
+def test_restored_index():
+    """An index restored from to_arrays() answers like the one it was saved from"""
+    store = CatalogStore.from_rows(random_catalog(500, seed=1))
+    built = CatalogSearchIndex(store)
+    restored = CatalogSearchIndex(store, built.to_arrays())
+    
+    for query in QUERIES:
+        assert restored.search(query, 50) == built.search(query, 50), query
+    assert [item.item_name for item in restored.get_by_code("C3")] == [item.item_name for item in built.get_by_code("C3")]
+    print("   ✅ restored index")
+
+if __name__ == "__main__":
+    print("🧪 Testing Catalog Search Index...")
+    try:
+        test_tier_order()
+        test_restored_index()
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        sys.exit(1)
+    print("\n🎉 All catalog search tests passed!")
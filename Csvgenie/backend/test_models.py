@@ -7,7 +7,7 @@ to find the best one for your use case
 import time
 import numpy as np
 from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
+from utils.similarity import cosine_similarity
 
 # Test queries (common grocery items)
 TEST_QUERIES = [
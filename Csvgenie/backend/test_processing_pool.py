@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Test the bounded order processing pool in services/processing_pool.py
+Run this script after changing PROCESSING_WORKERS / PROCESSING_QUEUE_LIMIT handling
+"""
+
+import sys
+import asyncio
+import threading
+import time
+from pathlib import Path
+
+# Add the backend directory to Python path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from services.processing_pool import ProcessingPool
+from utils.exceptions import ProcessingQueueFullError
+
+def expect_queue_full(submit) -> None:
+    try:
+        submit()
+    except ProcessingQueueFullError as e:
+        assert e.status_code == 503, f"queue full mapped to {e.status_code}, expected 503"
+    else:
+        raise AssertionError("submit succeeded with every slot taken")
+
+def test_queue_full():
+    """One running task plus one queued fill the pool; the next submit is a 503 until one finishes"""
+    pool = ProcessingPool(max_workers=1, max_queue=1)
+    release = threading.Event()
+    
+    try:
+        running = pool.submit(release.wait)
+        queued = pool.submit(lambda: "queued")
+        stats = pool.get_stats()
+        assert stats["in_flight"] == 2 and stats["queued"] == 1, stats
+        
+        expect_queue_full(lambda: pool.submit(lambda: None))
+        expect_queue_full(lambda: pool.stream(iter([])))
+        
+        release.set()
+        assert running.result(timeout=5) is True
+        assert queued.result(timeout=5) == "queued"
+        
+        # Slots are released from done callbacks, which may run just after result() returns
+        for _ in range(100):
+            if pool.get_stats()["in_flight"] == 0:
+                break
+            time.sleep(0.01)
+        assert pool.get_stats()["in_flight"] == 0, pool.get_stats()
+        assert pool.submit(lambda: "accepted").result(timeout=5) == "accepted"
+    finally:
+        release.set()
+        pool.shutdown()
+    print("   ✅ queue-full 503 and slot release")
+
+def test_run_and_stream():
+    """run() awaits a result; stream() yields every item and frees its slot when done"""
+    pool = ProcessingPool(max_workers=1, max_queue=0)
+    
+    async def exercise():
+        assert await pool.run(sum, [1, 2, 3]) == 6
+        
+        items = [item async for item in pool.stream(iter(range(5)))]
+        assert items == [0, 1, 2, 3, 4]
+        assert pool.get_stats()["in_flight"] == 0
+        
+        # An error inside the iterator reaches the caller and still frees the slot
+        def failing():
+            yield 1
+            raise ValueError("bad line")
+        
+        try:
+            async for _ in pool.stream(failing()):
+                pass
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("stream swallowed the iterator's error")
+        assert pool.get_stats()["in_flight"] == 0
+    
+    try:
+        asyncio.run(exercise())
+    finally:
+        pool.shutdown()
+    print("   ✅ run and stream")
+
+if __name__ == "__main__":
+    print("🧪 Testing Processing Pool...")
+    try:
+        test_queue_full()
+        test_run_and_stream()
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        sys.exit(1)
+    print("\n🎉 All processing pool tests passed!")
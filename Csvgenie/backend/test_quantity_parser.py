@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Test the compiled quantity parser against known order lines
+Run this script after changing utils/quantity_parser.py
+"""
+
+import sys
+from pathlib import Path
+
+# Add the backend directory to Python path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from utils.quantity_parser import parse_quantity_line
+
+# (line, expected quantity, expected item text) - matches the original regex cascade
+EXPECTED_RESULTS = [
+    ("Cardamom green 5lb *3pkts", 3.0, "Cardamom green"),
+    ("Cinnamon 5lb *3", 3.0, "Cinnamon"),
+    ("Urad Dhal 4*10lb- 1 case", 4.0, "Urad Dhal"),
+    ("Toor dal 3", 3.0, "Toor dal"),
+    ("Moong dal - 2 boxes", 2.0, "Moong dal -"),
+    ("2 bags of organic apples", 2.0, "bags of organic apples"),
+    ("- 2 bags of organic apples", 2.0, "bags of organic apples"),
+    ("2 3 apples", 2.0, "3 apples"),
+    ("Idly and dosa rice - 150lbs", 150.0, "Idly and dosa rice -"),
+    ("2 lbs apples", 0, "2 lbs apples"),
+    ("150lbs", 150.0, "lbs"),
+    ("10 kg rice", 0, "10 kg rice"),
+    ("rice 0", 0.0, "rice"),
+    ("Jeera", 0, "Jeera"),
+    ("x", 0, "x"),
+]
+
+def test_quantity_parser():
+    """Every known line parses to the expected quantity and item"""
+    print("🧪 Testing Quantity Parser...")
+    failures = 0
+    
+    for line, expected_quantity, expected_item in EXPECTED_RESULTS:
+        quantity, item_text = parse_quantity_line(line)
+        if (quantity, item_text) == (expected_quantity, expected_item):
+            print(f"   ✅ {line!r} → {quantity:g} × {item_text!r}")
+        else:
+            failures += 1
+            print(f"   ❌ {line!r} → {quantity:g} × {item_text!r}, expected {expected_quantity:g} × {expected_item!r}")
+    
+    assert failures == 0, f"{failures} lines parsed differently"
+    print("\n🎉 All quantity parser tests passed!")
+
+if __name__ == "__main__":
+    try:
+        test_quantity_parser()
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        sys.exit(1)
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Test the NumPy similarity kernels in utils/similarity.py
+Only needs numpy, so it also runs against the version pinned in requirements.txt
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add the backend directory to Python path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from utils.similarity import cosine_similarity, normalize_embeddings, top_k
+
+def test_normalize_embeddings():
+    """Rows come back unit length; copy=False reuses float32 input and copies anything else"""
+    rng = np.random.default_rng(0)
+    embeddings = rng.standard_normal((5, 8)).astype(np.float32)
+    original = embeddings.copy()
+    
+    normalized = normalize_embeddings(embeddings)
+    assert np.allclose(np.linalg.norm(normalized, axis=1), 1.0, atol=1e-6)
+    assert np.array_equal(embeddings, original), "copy=True changed the input"
+    
+    in_place = normalize_embeddings(embeddings, copy=False)
+    assert np.shares_memory(in_place, embeddings), "copy=False copied float32 C-contiguous input"
+    assert np.allclose(in_place, normalized)
+    
+    from_float64 = normalize_embeddings(original.astype(np.float64), copy=False)
+    assert from_float64.dtype == np.float32 and from_float64.flags.c_contiguous
+    assert np.allclose(from_float64, normalized)
+    
+    read_only = original.copy()
+    read_only.flags.writeable = False
+    assert np.allclose(normalize_embeddings(read_only, copy=False), normalized)
+    assert np.array_equal(read_only, original)
+    
+    single = normalize_embeddings(np.array([3.0, 4.0]), copy=False)
+    assert single.shape == (1, 2) and np.allclose(single, [[0.6, 0.8]])
+    
+    zero = normalize_embeddings(np.zeros((1, 4)))
+    assert np.all(np.isfinite(zero))
+    print(f"   ✅ normalize_embeddings (numpy {np.__version__})")
+
+def test_cosine_similarity():
+    """Matches the textbook formula, normalized or not"""
+    rng = np.random.default_rng(1)
+    queries = rng.standard_normal((3, 16))
+    matrix = rng.standard_normal((10, 16))
+    expected = (queries @ matrix.T) / np.outer(np.linalg.norm(queries, axis=1), np.linalg.norm(matrix, axis=1))
+    
+    assert np.allclose(cosine_similarity(queries, matrix), expected, atol=1e-5)
+    out = np.empty((3, 10), dtype=np.float32)
+    result = cosine_similarity(normalize_embeddings(queries), normalize_embeddings(matrix), normalized=True, out=out)
+    assert result is out and np.allclose(out, expected, atol=1e-5)
+    print("   ✅ cosine_similarity")
+
+def test_top_k():
+    """Best k per row, sorted best first, with k clamped to the row length"""
+    scores = np.array([[0.1, 0.9, 0.5, 0.7], [0.4, 0.3, 0.2, 0.1]], dtype=np.float32)
+    values, indices = top_k(scores, 2)
+    assert indices.tolist() == [[1, 3], [0, 1]]
+    assert np.allclose(values, [[0.9, 0.7], [0.4, 0.3]])
+    
+    _, indices = top_k(scores, 10)
+    assert indices.tolist() == [[1, 3, 2, 0], [0, 1, 2, 3]]
+    
+    values, indices = top_k(scores, 0)
+    assert values.shape == (2, 0) and indices.shape == (2, 0)
+    print("   ✅ top_k")
+
+if __name__ == "__main__":
+    print("🧪 Testing Similarity Kernels...")
+    try:
+        test_normalize_embeddings()
+        test_cosine_similarity()
+        test_top_k()
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        sys.exit(1)
+    print("\n🎉 All similarity tests passed!")
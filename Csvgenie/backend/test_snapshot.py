@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Test the binary catalog snapshot: utils/snapshot.py and CatalogService save/load
+Run this script after changing the snapshot layout or CATALOG_SNAPSHOT_VERSION
+"""
+
+import os
+import sys
+import stat
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+# Add the backend directory to Python path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from models.catalog_store import CatalogRow, CatalogStore
+from services.catalog_search import CatalogSearchIndex
+from services.catalog_service import CatalogService
+from utils.snapshot import read_snapshot, write_snapshot
+
+ROWS = [
+    CatalogRow("R001", "Basmati Rice 10lb", "Rice", "a.xlsx", "Sheet1"),
+    CatalogRow("D002", "Toor Dal 4lb", "Lentils", "a.xlsx", "Sheet1"),
+    CatalogRow("S003", "Jeera (जीरा) 200g", "Spices", "b.xlsx", "Spices"),
+    CatalogRow("R001", "Basmati Rice 10lb", "Rice", "b.xlsx", "Rice"),
+    CatalogRow("", "", "", "b.xlsx", "Rice"),
+]
+
+def test_array_round_trip():
+    """Arrays come back equal with their dtype and shape, mapped or read, and the file is not 0600"""
+    arrays = {
+        "float32": np.random.default_rng(0).standard_normal((7, 5)).astype(np.float32),
+        "int64": np.arange(-3, 10, dtype=np.int64),
+        "uint8": np.frombuffer("ünïcode".encode("utf-8"), dtype=np.uint8),
+        "empty": np.empty((0, 4), dtype=np.float16),
+        "strided": np.arange(20, dtype=np.int32)[::3],
+    }
+    metadata = {"version": 1, "name": "katalog ✓", "nested": {"a": [1, 2]}}
+    
+    with tempfile.TemporaryDirectory() as work_dir:
+        path = Path(work_dir) / "test.snapshot"
+        write_snapshot(path, arrays, metadata)
+        assert os.listdir(work_dir) == ["test.snapshot"], "temporary file left behind"
+        
+        # Same mode a plain open() would give, so another user or process can map it
+        umask = os.umask(0)
+        os.umask(umask)
+        assert stat.S_IMODE(path.stat().st_mode) == 0o666 & ~umask
+        
+        for mmap in (True, False):
+            loaded, loaded_metadata = read_snapshot(path, mmap=mmap)
+            assert loaded_metadata == metadata
+            assert set(loaded) == set(arrays)
+            for name, array in arrays.items():
+                assert loaded[name].dtype == array.dtype and loaded[name].shape == array.shape, name
+                assert np.array_equal(loaded[name], array), name
+            assert not loaded["float32"].flags.writeable or not mmap
+        
+        path.write_bytes(b"not a snapshot at all")
+        try:
+            read_snapshot(path)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("read_snapshot accepted a file without the snapshot header")
+    print("   ✅ array round trip")
+
+def test_catalog_round_trip():
+    """A saved catalog loads back with the same rows, code lookups, search results and embeddings"""
+    store = CatalogStore.from_rows(ROWS)
+    embeddings = np.random.default_rng(1).standard_normal((len(ROWS), 8)).astype(np.float32)
+    
+    with tempfile.TemporaryDirectory() as work_dir:
+        writer = CatalogService()
+        writer.snapshot_file = Path(work_dir) / "catalog.snapshot"
+        writer.store = store
+        writer.search_index = CatalogSearchIndex(store)
+        writer.workbook_fingerprints = {"a.xlsx": {"size": 1, "mtime_ns": 2, "sha256": "ab"}}
+        writer.save_catalog_snapshot(embeddings, "key-1")
+        
+        reader = CatalogService()
+        reader.snapshot_file = writer.snapshot_file
+        assert reader.load_catalog_snapshot()
+        assert reader.is_loaded()
+        assert list(reader.get_catalog_store().rows()) == ROWS
+        assert reader.workbook_fingerprints == writer.workbook_fingerprints
+        
+        for query in ["ri", "basmati", "dal 4", "जीरा", "zzz"]:
+            assert reader.search_items(query) == writer.search_index.search(query), query
+        assert [item.sheet_name for item in reader.get_items_by_codes(["R001"])["R001"]] == ["Sheet1", "Rice"]
+        
+        assert np.array_equal(reader.get_snapshot_embeddings("key-1"), embeddings)
+        assert reader.get_snapshot_embeddings("other-key") is None
+        
+        # Rewriting the rows alone keeps the embeddings saved with them
+        reader.save_catalog_snapshot()
+        assert np.array_equal(reader.get_snapshot_embeddings("key-1"), embeddings)
+    print("   ✅ catalog round trip")
+
+if __name__ == "__main__":
+    print("🧪 Testing Catalog Snapshot...")
+    try:
+        test_array_round_trip()
+        test_catalog_round_trip()
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        sys.exit(1)
+    print("\n🎉 All snapshot tests passed!")
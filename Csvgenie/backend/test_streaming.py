@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Test chunked line reading in utils/streaming.py
+Run this script after changing how uploads are read
+"""
+
+import io
+import sys
+import zipfile
+from pathlib import Path
+
+# Add the backend directory to Python path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from utils.exceptions import FileTooLargeError
+from utils.streaming import iter_file_lines, iter_zip_member_lines, list_zip_order_files
+
+ORDER_TEXT = "Grocery list\r\n2 basmati rice\r\n3 जीरा 100g\r\n\r\n1 café au lait 🥛\nlast line without newline"
+
+def test_lines_across_chunk_boundaries():
+    """Every chunk size gives the same lines as decoding the whole file and splitting it"""
+    data = ORDER_TEXT.encode("utf-8")
+    expected = data.decode("utf-8").split("\n")
+    
+    # Chunk sizes of 1-7 bytes split CRLF pairs and every multibyte character somewhere
+    for chunk_size in [1, 2, 3, 5, 7, 64, len(data), len(data) + 1]:
+        lines = list(iter_file_lines(io.BytesIO(data), chunk_size=chunk_size))
+        assert lines == expected, f"chunk_size={chunk_size} gave {lines!r}"
+    
+    assert list(iter_file_lines(io.BytesIO(b""))) == [""]
+    assert list(iter_file_lines(io.BytesIO(b"a\n"))) == ["a", ""]
+    print("   ✅ CRLF and multibyte text split across chunk boundaries")
+
+def test_size_limit():
+    """Reading stops with a 413 FileTooLargeError once more than max_bytes were read"""
+    data = ORDER_TEXT.encode("utf-8")
+    
+    assert len(list(iter_file_lines(io.BytesIO(data), chunk_size=4, max_bytes=len(data)))) > 0
+    
+    lines = iter_file_lines(io.BytesIO(data), chunk_size=4, max_bytes=len(data) - 1)
+    try:
+        list(lines)
+    except FileTooLargeError as e:
+        assert e.status_code == 413 and e.details["max_bytes"] == len(data) - 1
+    else:
+        raise AssertionError("a file over max_bytes was read completely")
+    print("   ✅ 413 cutoff at max_bytes")
+
+def test_zip_members():
+    """Zip members are listed without metadata files and limited by their decompressed size"""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("orders/a.txt", ORDER_TEXT)
+        archive.writestr("orders/.hidden.txt", "x")
+        archive.writestr("__MACOSX/orders/._a.txt", "x")
+        archive.writestr("orders/readme.md", "x")
+        archive.writestr("big.txt", "1 rice\n" * 10000)
+    
+    with zipfile.ZipFile(buffer) as archive:
+        members = list_zip_order_files(archive)
+        assert [info.filename for info in members] == ["orders/a.txt", "big.txt"]
+        
+        assert list(iter_zip_member_lines(archive, members[0], chunk_size=3)) == ORDER_TEXT.split("\n")
+        try:
+            list(iter_zip_member_lines(archive, members[1], max_bytes=1000))
+        except FileTooLargeError:
+            pass
+        else:
+            raise AssertionError("a zip member over max_bytes once decompressed was read completely")
+    print("   ✅ zip members")
+
+if __name__ == "__main__":
+    print("🧪 Testing Streaming Line Reader...")
+    try:
+        test_lines_across_chunk_boundaries()
+        test_size_limit()
+        test_zip_members()
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        sys.exit(1)
+    print("\n🎉 All streaming tests passed!")
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Test the vector indexes in services/vector_index.py
+Only needs numpy; run it after changing VECTOR_INDEX, IVF or precision handling
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add the backend directory to Python path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from services.vector_index import BruteForceIndex, IVFIndex, VectorIndex
+from utils.similarity import normalize_embeddings
+
+def clustered_embeddings(count: int, dimension: int = 32, clusters: int = 40, seed: int = 0) -> np.ndarray:
+    """Normalized vectors around a few centres, like embeddings of related catalog items"""
+    rng = np.random.default_rng(seed)
+    centres = rng.standard_normal((clusters, dimension))
+    vectors = centres[rng.integers(0, clusters, count)] + 0.3 * rng.standard_normal((count, dimension))
+    return normalize_embeddings(vectors)
+
+def recall(found: np.ndarray, exact: np.ndarray) -> float:
+    return np.mean([len(set(row) & set(truth)) / len(truth) for row, truth in zip(found, exact)])
+
+def test_brute_force():
+    """Exact search returns the true top k, best first, at every precision"""
+    embeddings = clustered_embeddings(500)
+    queries = clustered_embeddings(20, seed=1)
+    expected = np.argsort(-(queries @ embeddings.T), axis=1)[:, :5]
+    
+    scores, indices = BruteForceIndex(embeddings).search(queries, 5)
+    assert np.array_equal(indices, expected)
+    assert np.all(np.diff(scores, axis=1) <= 0)
+    
+    for precision in ("float16", "int8"):
+        _, indices = BruteForceIndex(embeddings, precision).search(queries, 5)
+        assert recall(indices, expected) >= 0.95, precision
+    print("   ✅ brute force")
+
+def test_ivf_recall():
+    """IVF keeps recall@10 high against brute force, and nprobe == nlist is exact"""
+    embeddings = clustered_embeddings(5000)
+    queries = clustered_embeddings(100, seed=2)
+    _, exact = BruteForceIndex(embeddings).search(queries, 10)
+    
+    for precision in ("float32", "int8"):
+        ivf = IVFIndex(embeddings, precision, nlist=64, nprobe=8)
+        _, indices = ivf.search(queries, 10)
+        value = recall(indices, exact)
+        assert value >= 0.9, f"IVF {precision} recall@10 {value:.3f}"
+        print(f"   ✅ IVF {precision} recall@10 {value:.3f} (nprobe 8 of 64)")
+    
+    _, indices = IVFIndex(embeddings, nlist=64, nprobe=64).search(queries, 10)
+    assert recall(indices, exact) == 1.0
+    
+    # k larger than the probed lists still returns k distinct rows
+    _, indices = IVFIndex(embeddings, nlist=64, nprobe=1).search(queries[:3], 400)
+    assert all(len(set(row)) == 400 for row in indices)
+
+def test_reconstruct():
+    """reconstruct() gives the rows back in catalog order, however the index stores them"""
+    embeddings = clustered_embeddings(300)
+    for index in (BruteForceIndex(embeddings), IVFIndex(embeddings, nlist=8)):
+        assert np.array_equal(index.reconstruct(), embeddings), index.name
+    assert np.allclose(IVFIndex(embeddings, "int8", nlist=8).reconstruct(), embeddings, atol=0.01)
+    
+    try:
+        VectorIndex(embeddings)
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("VectorIndex should be abstract")
+    print("   ✅ reconstruct")
+
+if __name__ == "__main__":
+    import logging
+    logging.disable(logging.INFO)
+    
+    print("🧪 Testing Vector Indexes...")
+    try:
+        test_brute_force()
+        test_ivf_recall()
+        test_reconstruct()
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        sys.exit(1)
+    print("\n🎉 All vector index tests passed!")
@@ -0,0 +1,72 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterator, Optional, Tuple
+
+class LRUCache:
+    """Thread-safe least-recently-used cache with optional time-to-live and hit/miss counters"""
+    
+    def __init__(self, max_size: int, ttl_seconds: float = 0):
+        self.max_size = max(0, max_size)
+        self.ttl_seconds = max(0.0, ttl_seconds)
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a value and mark it as recently used, or return default on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or self._is_expired(entry[1]):
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return default
+            
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+    
+    def put(self, key: Hashable, value: Any, stored_at: Optional[float] = None) -> None:
+        """Store a value, evicting the least recently used entries beyond max_size"""
+        if self.max_size == 0:
+            return
+        
+        with self._lock:
+            self._entries[key] = (value, stored_at if stored_at is not None else time.time())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Remove every entry"""
+        with self._lock:
+            self._entries.clear()
+    
+    def items(self) -> Iterator[Tuple[Hashable, Any, float]]:
+        """Iterate over a snapshot of unexpired (key, value, stored_at) entries, oldest first"""
+        with self._lock:
+            entries = list(self._entries.items())
+        
+        for key, (value, stored_at) in entries:
+            if not self._is_expired(stored_at):
+                yield key, value, stored_at
+    
+    def _is_expired(self, stored_at: float) -> bool:
+        return self.ttl_seconds > 0 and time.time() - stored_at > self.ttl_seconds
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache size and hit/miss counters"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
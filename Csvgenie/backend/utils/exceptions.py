@@ -59,3 +59,44 @@ class ValidationError(CSVGenieException):
             details=details,
             status_code=400
         )
+
+class ProcessingQueueFullError(CSVGenieException):
+    """Exception raised when the order processing queue is at capacity"""
+    
+    def __init__(self, message: str, details: Optional[Dict[str, Any]] = None):
+        super().__init__(
+            message=message,
+            error_code="PROCESSING_QUEUE_FULL",
+            details=details,
+            status_code=503
+        )
+
+class FileTooLargeError(FileProcessingError):
+    """Exception raised when an uploaded file exceeds the configured size limit"""
+    
+    def __init__(self, message: str, details: Optional[Dict[str, Any]] = None):
+        super().__init__(message=message, details=details)
+        self.error_code = "FILE_TOO_LARGE"
+        self.status_code = 413
+
+class JobNotFoundError(CSVGenieException):
+    """Exception raised when a processing job does not exist or its result has expired"""
+    
+    def __init__(self, message: str, details: Optional[Dict[str, Any]] = None):
+        super().__init__(
+            message=message,
+            error_code="JOB_NOT_FOUND",
+            details=details,
+            status_code=404
+        )
+
+class JobNotFinishedError(CSVGenieException):
+    """Exception raised when a job result is requested before the job has completed"""
+    
+    def __init__(self, message: str, details: Optional[Dict[str, Any]] = None):
+        super().__init__(
+            message=message,
+            error_code="JOB_NOT_FINISHED",
+            details=details,
+            status_code=409
+        )
@@ -0,0 +1,125 @@
+import re
+import logging
+from typing import Callable, List, Optional, Pattern, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Weight/volume units - a line with one of these is a weight spec, not an order quantity
+_WEIGHT_UNITS = r'lbs?|kg|g|oz|ml|l|qt|gal'
+
+# Unit words that may follow a "Weight * Quantity" multiplier
+_PACK_UNITS = r'pkts?|packets?|pcs?|pieces?|units?|bags?|bottles?|cans?|boxes?|case'
+
+# Branches tried in order, as the original cascade did:
+#   weight  - "Item Weight * Quantity [units]" (e.g. "Cardamom green 5lb *3pkts", "Cinnamon 5lb *3")
+#   trailing - "Item ... Quantity" (first number preceded by whitespace)
+#   leading  - "Quantity Item"
+_BRANCH_PATTERNS = [
+    ('weight', r'(?P<weight_item>.+?)\s+\d+(?:\.\d+)?\s*(?:' + _WEIGHT_UNITS + r')\s*\*\s*'
+               r'(?P<weight_qty>\d+(?:\.\d+)?)(?:\s*(?:' + _PACK_UNITS + r'))?$'),
+    ('trailing', r'(?P<trailing_item>.+?)\s+(?P<trailing_qty>\d+(?:\.\d+)?)'),
+    ('leading', r'(?P<leading_qty>\d+(?:\.\d+)?)\s+(?P<leading_item>.+)'),
+]
+
+# One alternation classifies a line in a single regex pass; the individual branches
+# are only needed when the matched branch's result is rejected and later ones must be tried
+QUANTITY_LINE_PATTERN: Pattern = re.compile(
+    '^(?:' + '|'.join(f'(?P<{name}>{pattern})' for name, pattern in _BRANCH_PATTERNS) + ')',
+    re.IGNORECASE
+)
+_BRANCH_REGEXES: List[Pattern] = [re.compile('^' + pattern, re.IGNORECASE) for _, pattern in _BRANCH_PATTERNS]
+_BRANCH_POSITIONS = {name: position for position, (name, _) in enumerate(_BRANCH_PATTERNS)}
+
+_WEIGHT_UNIT_WORD = re.compile(r'\b(?:' + _WEIGHT_UNITS + r')\b', re.IGNORECASE)
+_LEADING_DASH = re.compile(r'^\s*[-–—]\s*')
+_NUMBER = re.compile(r'\d+(?:\.\d+)?')
+
+_WEIGHT_SPEC = object()  # Marker: the line is a weight specification
+
+def _clean_item_text(item_text: str) -> str:
+    return _LEADING_DASH.sub('', item_text).strip()
+
+def _is_valid(quantity: float, item_text: str) -> bool:
+    return quantity > 0 and len(item_text) > 1
+
+def _parse_weight(match) -> Optional[Tuple[float, str]]:
+    quantity = float(match.group('weight_qty'))
+    item_text = _clean_item_text(match.group('weight_item'))
+    return (quantity, item_text) if _is_valid(quantity, item_text) else None
+
+def _parse_trailing(match) -> Optional[Tuple[float, str]]:
+    first = match.group('trailing_item').strip()
+    second = match.group('trailing_qty')
+    
+    # The item part may itself parse as a number (e.g. "2 3 apples")
+    try:
+        quantity = float(first)
+        item_text = second
+    except ValueError:
+        quantity = float(second)
+        item_text = first
+    
+    item_text = _clean_item_text(item_text)
+    return (quantity, item_text) if _is_valid(quantity, item_text) else None
+
+def _parse_leading(match):
+    item_text = match.group('leading_item').strip()
+    if _WEIGHT_UNIT_WORD.search(item_text):
+        return _WEIGHT_SPEC
+    
+    quantity = float(match.group('leading_qty'))
+    item_text = _clean_item_text(item_text)
+    return (quantity, item_text) if _is_valid(quantity, item_text) else None
+
+_BRANCH_PARSERS: List[Callable] = [_parse_weight, _parse_trailing, _parse_leading]
+
+def _parse_fallback(text: str) -> Tuple[float, str]:
+    """Use the first number anywhere in the line as the quantity"""
+    number_match = _NUMBER.search(text)
+    if number_match:
+        potential_quantity = float(number_match.group(0))
+        item_text = _LEADING_DASH.sub('', _NUMBER.sub('', text).strip())
+        
+        # Check if this looks like a weight specification
+        if _WEIGHT_UNIT_WORD.search(text):
+            logger.debug(f"Weight specification detected in fallback: '{text}' - treating as unmapped")
+            return 0, text
+        
+        if item_text and len(item_text) > 1:
+            logger.debug(f"Fallback parsed: '{item_text}' (Qty: {potential_quantity}) from '{text}'")
+            return potential_quantity, item_text
+    
+    # If we can't parse anything, return 0 quantity to mark as unmapped
+    logger.debug(f"Could not parse quantity from: '{text}' - marking as unmapped")
+    return 0, text
+
+def parse_quantity_line(text: str) -> Tuple[float, str]:
+    """Extract (quantity, item_text) from one order line
+    
+    A quantity of 0 marks the line as unmapped (weight specification or unparseable).
+    """
+    text = text.strip()
+    
+    match = QUANTITY_LINE_PATTERN.match(text)
+    if match:
+        # The enclosing branch group closes last, so lastgroup names the branch that matched
+        branch = _BRANCH_POSITIONS[match.lastgroup]
+        result = _BRANCH_PARSERS[branch](match)
+        
+        # Rare case: the branch matched but its result was rejected, so resume with the later branches
+        for next_branch in range(branch + 1, len(_BRANCH_PATTERNS)):
+            if result is not None:
+                break
+            next_match = _BRANCH_REGEXES[next_branch].match(text)
+            if next_match:
+                result = _BRANCH_PARSERS[next_branch](next_match)
+        
+        if result is _WEIGHT_SPEC:
+            logger.debug(f"Weight specification detected: '{text}' - treating as unmapped")
+            return 0, text
+        if result is not None:
+            logger.debug(f"Parsed: '{result[1]}' (Qty: {result[0]}) from '{text}'")
+            return result
+    
+    logger.warning(f"No pattern matched for text: '{text}'")
+    return _parse_fallback(text)
@@ -0,0 +1,58 @@
+from typing import Optional, Tuple
+
+import numpy as np
+
+def normalize_embeddings(embeddings: np.ndarray, copy: bool = True) -> np.ndarray:
+    """L2-normalize each row into a C-contiguous float32 matrix
+    
+    With copy=False a float32 C-contiguous input is normalized in place - use it for
+    arrays the caller owns, such as fresh encoder output.
+    """
+    if copy:
+        vectors = np.array(embeddings, dtype=np.float32, order='C', ndmin=2)
+    else:
+        # asarray only copies when the dtype or layout has to change; np.array(copy=False)
+        # means "never copy" on NumPy 2 and "copy if needed" on the pinned NumPy 1.x
+        vectors = np.atleast_2d(np.asarray(embeddings, dtype=np.float32, order='C'))
+    if not vectors.flags.writeable:
+        vectors = vectors.copy()
+    
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    np.maximum(norms, 1e-12, out=norms)
+    vectors /= norms
+    return vectors
+
+def cosine_similarity(queries: np.ndarray, matrix: np.ndarray, normalized: bool = False,
+                      out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Cosine similarity of every query row against every matrix row
+    
+    Pass normalized=True when both sides are already unit length: the result is then a
+    single matrix product, written into `out` if given.
+    """
+    if not normalized:
+        queries = normalize_embeddings(queries)
+        matrix = normalize_embeddings(matrix)
+    else:
+        queries = np.asarray(queries, dtype=np.float32)
+        matrix = np.asarray(matrix, dtype=np.float32)
+    
+    if out is None:
+        out = np.empty((queries.shape[0], matrix.shape[0]), dtype=np.float32)
+    return np.matmul(queries, matrix.T, out=out)
+
+def top_k(scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Return the k best (scores, indices) per row, sorted best first"""
+    k = min(k, scores.shape[1])
+    if k <= 0:
+        empty = np.empty((scores.shape[0], 0))
+        return empty, empty.astype(np.int64)
+    
+    # argpartition is O(n) per row; only the k survivors get sorted
+    if k < scores.shape[1]:
+        candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    else:
+        candidates = np.tile(np.arange(scores.shape[1]), (scores.shape[0], 1))
+    
+    candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+    order = np.argsort(-candidate_scores, axis=1, kind='stable')
+    return np.take_along_axis(candidate_scores, order, axis=1), np.take_along_axis(candidates, order, axis=1)
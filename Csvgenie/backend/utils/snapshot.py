@@ -0,0 +1,87 @@
+import os
+import json
+import struct
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Tuple
+
+import numpy as np
+
+# File layout: magic, little-endian uint64 header length, JSON header, then every array's
+# raw bytes at a 64-byte aligned offset so the whole file can be memory-mapped
+SNAPSHOT_MAGIC = b"CSVGSNP1"
+_PREFIX = struct.Struct("<8sQ")
+_ALIGNMENT = 64
+
+# mkstemp creates files as 0600; snapshots get the mode open() would have given them.
+# Read once at import, because os.umask can only be read by setting it
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+def _align(offset: int) -> int:
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+def write_snapshot(path: Path, arrays: Dict[str, np.ndarray], metadata: Dict[str, Any]) -> None:
+    """Write named arrays and JSON-serializable metadata to one file, replacing it atomically"""
+    arrays = {name: np.ascontiguousarray(array) for name, array in arrays.items()}
+    
+    entries = {}
+    offset = 0
+    for name, array in arrays.items():
+        if array.dtype.hasobject:
+            raise ValueError(f"Snapshot array '{name}' has object dtype")
+        offset = _align(offset)
+        entries[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+        offset += array.nbytes
+    
+    header = json.dumps({"metadata": metadata, "arrays": entries}, ensure_ascii=False).encode("utf-8")
+    data_start = _align(_PREFIX.size + len(header))
+    
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # A temp file per writer, not per process, so concurrent writers never share one
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_PREFIX.pack(SNAPSHOT_MAGIC, len(header)))
+            f.write(header)
+            for name, array in arrays.items():
+                f.seek(data_start + entries[name]["offset"])
+                array.tofile(f)
+            f.truncate(data_start + offset)
+        os.chmod(tmp_name, 0o666 & ~_UMASK)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+def read_snapshot(path: Path, mmap: bool = True) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+    """Read a snapshot back as (arrays, metadata)
+    
+    With mmap=True every array is a read-only view into one shared file mapping, so
+    nothing is parsed or copied up front. Raises ValueError if the file is not a snapshot.
+    """
+    with open(path, "rb") as f:
+        prefix = f.read(_PREFIX.size)
+        if len(prefix) != _PREFIX.size:
+            raise ValueError(f"{path} is too short to be a snapshot")
+        magic, header_length = _PREFIX.unpack(prefix)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError(f"{path} is not a {SNAPSHOT_MAGIC.decode()} snapshot")
+        header = json.loads(f.read(header_length).decode("utf-8"))
+    
+    data_start = _align(_PREFIX.size + header_length)
+    if mmap and os.path.getsize(path) > data_start:
+        buffer = np.memmap(path, dtype=np.uint8, mode="r")
+    else:
+        buffer = np.fromfile(path, dtype=np.uint8)
+    
+    arrays = {}
+    for name, entry in header["arrays"].items():
+        dtype = np.dtype(entry["dtype"])
+        start = data_start + entry["offset"]
+        count = int(np.prod(entry["shape"], dtype=np.int64))
+        arrays[name] = buffer[start:start + count * dtype.itemsize].view(dtype).reshape(entry["shape"])
+    return arrays, header["metadata"]
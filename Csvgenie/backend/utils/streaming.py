@@ -0,0 +1,73 @@
+import codecs
+import zipfile
+from pathlib import PurePosixPath
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+
+from utils.exceptions import FileProcessingError, FileTooLargeError
+
+def iter_file_lines(
+    binary_file: BinaryIO,
+    chunk_size: int = 65536,
+    max_bytes: Optional[int] = None,
+    encoding: str = "utf-8"
+) -> Iterator[str]:
+    """Read a binary file in chunks and yield its decoded lines one at a time
+    
+    Yields the same lines as ``data.decode(encoding).split('\\n')`` without holding
+    the whole file in memory. Raises FileTooLargeError once more than ``max_bytes``
+    have been read.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)()
+    total_bytes = 0
+    pending = ""
+    
+    while True:
+        chunk = binary_file.read(chunk_size)
+        if not chunk:
+            break
+        
+        total_bytes += len(chunk)
+        if max_bytes is not None and total_bytes > max_bytes:
+            raise FileTooLargeError(
+                f"File exceeds the maximum size of {max_bytes} bytes",
+                details={"max_bytes": max_bytes}
+            )
+        
+        # Keep the trailing partial line until the next chunk completes it
+        lines = (pending + decoder.decode(chunk)).split("\n")
+        pending = lines.pop()
+        yield from lines
+    
+    yield pending + decoder.decode(b"", final=True)
+
+def list_zip_order_files(zip_file: zipfile.ZipFile, extensions: Tuple[str, ...] = (".txt",)) -> List[zipfile.ZipInfo]:
+    """List the order files in a zip archive, skipping directories and macOS metadata"""
+    members = []
+    for info in zip_file.infolist():
+        path = PurePosixPath(info.filename)
+        if info.is_dir() or path.name.startswith(".") or "__MACOSX" in path.parts:
+            continue
+        if path.suffix.lower() in extensions:
+            members.append(info)
+    return members
+
+def open_zip_archive(binary_file: BinaryIO) -> zipfile.ZipFile:
+    """Open an uploaded zip archive, raising FileProcessingError if it is not a valid zip"""
+    try:
+        return zipfile.ZipFile(binary_file)
+    except zipfile.BadZipFile as e:
+        raise FileProcessingError(f"Invalid zip archive: {e}")
+
+def iter_zip_member_lines(
+    zip_file: zipfile.ZipFile,
+    info: zipfile.ZipInfo,
+    chunk_size: int = 65536,
+    max_bytes: Optional[int] = None
+) -> Iterator[str]:
+    """Decompress one zip member in chunks and yield its decoded lines
+    
+    ``max_bytes`` applies to the decompressed size, so a small archive cannot expand
+    past the per-file limit.
+    """
+    with zip_file.open(info) as member:
+        yield from iter_file_lines(member, chunk_size=chunk_size, max_bytes=max_bytes)
@@ -0,0 +1,59 @@
+import re
+from typing import List
+
+# Header and filler phrases removed anywhere in an order line
+ORDER_HEADERS = [
+    'grocery list', 'shopping list', 'order', 'items', 'need to buy',
+    'please make sure', 'everything is fresh', 'organic when possible'
+]
+
+# Canonical form -> whole-word variants folded into it (plurals and unit spellings)
+ORDER_TERM_VARIANTS = {
+    'apple': r'apples?',
+    'banana': r'bananas?',
+    'orange': r'oranges?',
+    'tomato': r'tomatoes?',
+    'onion': r'onions?',
+    'potato': r'potatoes?',
+    'lb': r'lbs?|pounds?',
+    'oz': r'oz|ounces?',
+    'g': r'grams?|g',
+    'ml': r'ml|milliliters?',
+}
+
+_HEADER_PATTERN = re.compile('|'.join(re.escape(header) for header in ORDER_HEADERS))
+
+# One alternation for every term; the named group that matched is the canonical form
+_TERM_PATTERN = re.compile(
+    r'\b(?:' + '|'.join(f'(?P<{canonical}>{variants})' for canonical, variants in ORDER_TERM_VARIANTS.items()) + r')\b'
+)
+
+_WHITESPACE = re.compile(r'\s+')
+_INLINE_WHITESPACE = re.compile(r'[^\S\n]+')
+
+def _replace_term(match) -> str:
+    return match.lastgroup
+
+def normalize_order_text(text: str) -> str:
+    """Lowercase, strip headers, fold plurals and units, and collapse whitespace"""
+    text = _HEADER_PATTERN.sub('', text.lower())
+    text = _TERM_PATTERN.sub(_replace_term, text)
+    return _WHITESPACE.sub(' ', text).strip()
+
+def normalize_order_texts(texts: List[str]) -> List[str]:
+    """Normalize many order lines at once
+    
+    The lines are joined and run through each substitution a single time, so the
+    per-line Python overhead doesn't grow with the size of the order.
+    """
+    if not texts:
+        return []
+    
+    # Joining on newlines is only safe when no line contains one
+    if any('\n' in text for text in texts):
+        return [normalize_order_text(text) for text in texts]
+    
+    joined = _HEADER_PATTERN.sub('', '\n'.join(texts).lower())
+    joined = _TERM_PATTERN.sub(_replace_term, joined)
+    joined = _INLINE_WHITESPACE.sub(' ', joined)
+    return [line.strip() for line in joined.split('\n')]
@@ -83,6 +83,56 @@ export const processOrderFile = async (formData, onProgress) => {
   }
 };
 
+/**
+ * Process an order file, receiving each match as soon as it is ready
+ * @param {FormData} formData - Form data containing the file
+ * @param {Function} onRecord - Called with each {type: 'mapped' | 'unmapped' | 'summary' | 'error', ...} record
+ * @returns {Promise<Object>} The final summary record
+ */
+export const processOrderFileStream = async (formData, onRecord) => {
+  try {
+    // axios buffers the whole body in the browser, so read the NDJSON stream with fetch
+    const response = await fetch(`${API_BASE_URL}/upload-order-file/stream?format=ndjson`, {
+      method: 'POST',
+      body: formData,
+    });
+
+    if (!response.ok) {
+      const error = await response.json().catch(() => ({}));
+      throw new Error(error.detail || `Upload failed with status ${response.status}`);
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    let summary = null;
+
+    const handleLine = (line) => {
+      if (!line.trim()) return;
+      const record = JSON.parse(line);
+      if (record.type === 'error') throw new Error(record.detail);
+      if (record.type === 'summary') summary = record;
+      onRecord(record);
+    };
+
+    while (true) {
+      const { done, value } = await reader.read();
+      if (done) break;
+
+      buffer += decoder.decode(value, { stream: true });
+      const lines = buffer.split('\n');
+      buffer = lines.pop();
+      lines.forEach(handleLine);
+    }
+    handleLine(buffer + decoder.decode());
+
+    return summary;
+  } catch (error) {
+    console.error('Error streaming order file:', error);
+    throw error;
+  }
+};
+
 /**
  * Get catalog information from the backend
  * @returns {Promise<Object>} Catalog statistics